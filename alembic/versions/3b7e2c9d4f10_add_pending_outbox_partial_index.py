@@ -0,0 +1,42 @@
+"""add partial index for pending outbox events
+
+Revision ID: 3b7e2c9d4f10
+Revises: 9df4c6d58e5f
+Create Date: 2026-10-15 10:00:00.000000
+
+"""
+
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3b7e2c9d4f10"
+down_revision: Union[str, None] = "9df4c6d58e5f"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Built concurrently outside the migration transaction so dispatchers keep
+    # writing to outbox_events while the index is created.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_outbox_events_pending_created_at",
+            "outbox_events",
+            ["created_at"],
+            unique=False,
+            postgresql_where=sa.text("status = 'pending'"),
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_outbox_events_pending_created_at",
+            table_name="outbox_events",
+            postgresql_concurrently=True,
+        )
@@ -63,13 +63,38 @@ def upgrade():
         sa.PrimaryKeyConstraint("id"),
     )
     op.create_index("ix_outbox_events_event_key", "outbox_events", ["event_key"], unique=True)
-    op.create_index("ix_outbox_events_topic", "outbox_events", ["topic"], unique=False)
-    op.create_index("ix_outbox_events_status", "outbox_events", ["status"], unique=False)
+
+    # Non-unique lookup indexes are built concurrently outside the migration
+    # transaction so they do not hold schema locks on busy databases.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_outbox_events_topic",
+            "outbox_events",
+            ["topic"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_outbox_events_status",
+            "outbox_events",
+            ["status"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
 
 
 def downgrade():
-    op.drop_index("ix_outbox_events_status", table_name="outbox_events")
-    op.drop_index("ix_outbox_events_topic", table_name="outbox_events")
+    with op.get_context().autocommit_block():
+        op.drop_index(
+            "ix_outbox_events_status",
+            table_name="outbox_events",
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "ix_outbox_events_topic",
+            table_name="outbox_events",
+            postgresql_concurrently=True,
+        )
     op.drop_index("ix_outbox_events_event_key", table_name="outbox_events")
     op.drop_table("outbox_events")
     op.drop_index("ix_refresh_tokens_jti", table_name="refresh_tokens")
@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Optional
 from urllib.parse import urlparse
 
@@ -17,12 +18,17 @@ class Settings(BaseSettings):
     database_password: str = "password123"
     database_name: str = "fastapi"
     database_username: str = "postgres"
+    database_pool_size: int = 20
+    database_max_overflow: int = 10
+    database_pool_recycle_seconds: int = 1800
     secret_key: str = "replace-this-in-production"
     algorithm: str = "HS256"
     token_issuer: str = "fastapi-template"
     token_audience: str = "fastapi-template-api"
     access_token_expire_minutes: int = 60
     refresh_token_expire_days: int = 30
+    auth_user_cache_ttl_seconds: float = 30.0
+    auth_user_cache_max_entries: int = 10000
 
     # API versioning
     api_latest_version: str = "v1"
@@ -33,9 +39,12 @@ class Settings(BaseSettings):
     enable_optional_observability: bool = True
     enable_optional_background_jobs: bool = True
     enable_optional_frontend: bool = True
+    static_cache_max_age_seconds: int = 3600
 
     # Rate limiting / Redis
     redis_url: str = "redis://localhost:6379/0"
+    redis_max_connections: int = 64
+    redis_health_check_interval_seconds: int = 30
     rate_limit_enabled: bool = True
     rate_limit_fail_open: bool = False
     rate_limit_login_limit: int = 10
@@ -49,6 +58,7 @@ class Settings(BaseSettings):
 
     # Readiness checks
     redis_health_required: bool = False
+    readiness_cache_ttl_seconds: float = 1.0
 
     # Observability
     metrics_enabled: bool = True
@@ -66,6 +76,7 @@ class Settings(BaseSettings):
 
     # OAuth / third-party login
     oauth_state_expire_seconds: int = 300
+    oauth_state_replay_max_entries: int = 10000
     oauth_public_base_url: Optional[str] = None
     oauth_frontend_callback_url: str = "/"
     oauth_google_client_id: Optional[str] = None
@@ -147,4 +158,10 @@ class Settings(BaseSettings):
         return self
 
 
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Return the process-wide settings, parsing env sources only once."""
+    return Settings()
+
+
+settings = get_settings()
@@ -3,24 +3,43 @@ from __future__ import annotations
 from http import HTTPStatus
 from typing import Any
 
+import orjson
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.exceptions import RequestValidationError
 from fastapi.responses import JSONResponse
 from starlette.exceptions import HTTPException as StarletteHTTPException
 
+_STATUS_TITLES: dict[int, str] = {int(status): status.phrase for status in HTTPStatus}
+_STATUS_ERROR_CODES: dict[int, str] = {
+    int(status): f"http_{int(status)}" for status in HTTPStatus
+}
+
+
+class ProblemJSONResponse(JSONResponse):
+    """RFC 7807 response serialized with orjson."""
+
+    media_type = "application/problem+json"
+
+    def render(self, content: Any) -> bytes:
+        try:
+            return orjson.dumps(content)
+        except TypeError:
+            # orjson rejects e.g. integers wider than 64 bits, which validation
+            # errors can echo back from client input.
+            return super().render(content)
+
 
 def _status_title(status_code: int) -> str:
-    try:
-        return HTTPStatus(status_code).phrase
-    except ValueError:
-        return "Error"
+    return _STATUS_TITLES.get(status_code, "Error")
 
 
 def _status_error_code(status_code: int) -> str:
-    return f"http_{status_code}"
+    return _STATUS_ERROR_CODES.get(status_code) or f"http_{status_code}"
 
 
 def _normalize_detail(detail: Any) -> tuple[str, str]:
+    if type(detail) is str:
+        return detail, "request_failed"
     if isinstance(detail, dict):
         text = str(detail.get("detail", "Request failed"))
         code = str(detail.get("error_code", "request_failed"))
@@ -45,7 +64,7 @@ def problem_document(
         "title": title,
         "status": status_code,
         "detail": detail,
-        "instance": str(request.url.path),
+        "instance": request.scope["path"],
         "error_code": error_code,
     }
     if extra:
@@ -64,7 +83,7 @@ def problem_response(
     headers: dict[str, str] | None = None,
     extra: dict[str, Any] | None = None,
 ) -> JSONResponse:
-    return JSONResponse(
+    return ProblemJSONResponse(
         status_code=status_code,
         content=problem_document(
             request=request,
@@ -76,7 +95,6 @@ def problem_response(
             extra=extra,
         ),
         headers=headers,
-        media_type="application/problem+json",
     )
 
 
@@ -1,5 +1,8 @@
 from __future__ import annotations
 
+import asyncio
+import time
+
 from sqlalchemy import text
 from sqlalchemy.exc import SQLAlchemyError
 
@@ -7,6 +10,9 @@ from .config import settings
 from .database import engine
 from .redis_client import ping_redis
 
+# Monotonic timestamp and checks of the last fully successful readiness probe.
+_last_ready: tuple[float, dict[str, bool]] | None = None
+
 
 def database_ready() -> bool:
     try:
@@ -23,9 +29,29 @@ def redis_ready() -> bool:
     return ping_redis()
 
 
-def readiness_state() -> tuple[bool, dict[str, bool]]:
+def reset_readiness_cache() -> None:
+    global _last_ready
+    _last_ready = None
+
+
+async def readiness_state() -> tuple[bool, dict[str, bool]]:
+    global _last_ready
+    now = time.monotonic()
+    if (
+        _last_ready is not None
+        and now - _last_ready[0] < settings.readiness_cache_ttl_seconds
+    ):
+        return True, dict(_last_ready[1])
+
+    # Both probes block on network I/O, so run them concurrently off the event loop.
+    database_ok, redis_ok = await asyncio.gather(
+        asyncio.to_thread(database_ready), asyncio.to_thread(redis_ready)
+    )
     checks = {
-        "database": database_ready(),
-        "redis": redis_ready(),
+        "database": database_ok,
+        "redis": redis_ok,
     }
-    return all(checks.values()), checks
+    ready = all(checks.values())
+    # Only successes are cached so a recovering dependency is reported immediately.
+    _last_ready = (now, dict(checks)) if ready else None
+    return ready, checks
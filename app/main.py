@@ -1,31 +1,76 @@
 from __future__ import annotations
 
+import re
+from collections.abc import AsyncIterator, Sequence
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from importlib import import_module
 from pathlib import Path
 from pkgutil import iter_modules
+from typing import Any
 
-from fastapi import APIRouter, FastAPI, HTTPException, Request
+from fastapi import APIRouter, FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, ORJSONResponse
 from fastapi.staticfiles import StaticFiles
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 from starlette.middleware.trustedhost import TrustedHostMiddleware
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from .config import settings
 from .errors import register_exception_handlers
 from .health import readiness_state
-from .observability import configure_observability
+from .oauth_external import close_http_client
+from .observability import configure_observability, warn_if_default_event_loop
 from .routers import auth, post, user, vote
 
-app = FastAPI()
+
+@asynccontextmanager
+async def _lifespan(_: FastAPI) -> AsyncIterator[None]:
+    # Launchers pin uvloop/httptools; flag deploys that fell back to asyncio.
+    warn_if_default_event_loop()
+    yield
+    await close_http_client()
+
+
+app = FastAPI(default_response_class=ORJSONResponse, lifespan=_lifespan)
 configure_observability(app)
 register_exception_handlers(app)
 
 frontend_dir = Path(__file__).resolve().parent / "frontend"
 static_dir = frontend_dir / "static"
+# Resolved once so serving "/" does not stat the filesystem on every request.
+_index_candidate = frontend_dir / "index.html"
+_INDEX_FILE: Path | None = (
+    _index_candidate
+    if settings.enable_optional_frontend and _index_candidate.exists()
+    else None
+)
+
+
+class CachedStaticFiles(StaticFiles):
+    """Static files with a shared-cache policy so browsers and proxies reuse them."""
+
+    def __init__(self, *args: Any, max_age: int, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        # Asset names are not content-hashed, so no ``immutable`` and a bounded TTL.
+        self.cache_control = f"public, max-age={max_age}"
+
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        response = await super().get_response(path, scope)
+        response.headers.setdefault("Cache-Control", self.cache_control)
+        return response
+
 
 if static_dir.exists():
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
+    app.mount(
+        "/static",
+        CachedStaticFiles(
+            directory=static_dir, max_age=settings.static_cache_max_age_seconds
+        ),
+        name="static",
+    )
 
 if settings.trusted_hosts:
     app.add_middleware(TrustedHostMiddleware, allowed_hosts=settings.trusted_hosts)
@@ -35,13 +80,24 @@ if settings.security_https_redirect:
 
 app.add_middleware(
     CORSMiddleware,
-    allow_origins=settings.cors_origins,
+    # A frozenset keeps the per-request origin check O(1) as the allow-list grows.
+    allow_origins=frozenset(settings.cors_origins),  # type: ignore[arg-type]
     allow_credentials=False,
     allow_methods=["*"],
     allow_headers=["*"],
 )
 
-_DOCS_PATHS = {"/docs", "/redoc", "/openapi.json", "/docs/oauth2-redirect"}
+# Exact matches only: a prefix test would also drop CSP for e.g. "/documents".
+_DOCS_PATHS: frozenset[str] = frozenset(
+    path
+    for path in (
+        app.docs_url,
+        app.redoc_url,
+        app.openapi_url,
+        app.swagger_ui_oauth2_redirect_url,
+    )
+    if path
+)
 _CSP_POLICY = (
     "default-src 'self'; "
     "base-uri 'self'; "
@@ -50,97 +106,208 @@ _CSP_POLICY = (
     "form-action 'self'"
 )
 
+# Request-path policy is resolved once at import; per-request attribute access on
+# the settings model is comparatively expensive on hot middleware paths.
+_LATEST_VERSION = settings.api_latest_version
+_SUPPORTED_VERSIONS: frozenset[str] = frozenset(settings.api_supported_versions)
+_SECURITY_HEADERS_ENABLED = settings.security_headers_enabled
+_CSP_ENABLED = settings.security_csp_enabled
+_HSTS_ENABLED = settings.security_hsts_enabled
+_AUTH_PATH_RE = re.compile(r"/api/[^/]+/(?:login|auth/(?:refresh|logout|oauth/))")
+# Header names and values are pre-encoded for direct injection into ASGI messages.
+_STATIC_SECURITY_HEADERS: tuple[tuple[bytes, bytes], ...] = (
+    (b"x-content-type-options", b"nosniff"),
+    (b"x-frame-options", b"DENY"),
+    (b"referrer-policy", b"no-referrer"),
+    (
+        b"permissions-policy",
+        b"camera=(), geolocation=(), microphone=(), payment=(), usb=()",
+    ),
+    (b"cross-origin-opener-policy", b"same-origin"),
+    (b"cross-origin-resource-policy", b"same-origin"),
+    (b"x-permitted-cross-domain-policies", b"none"),
+)
+_CSP_HEADER = (b"content-security-policy", _CSP_POLICY.encode("latin-1"))
+_HSTS_HEADER = (
+    b"strict-transport-security",
+    f"max-age={settings.security_hsts_max_age_seconds}; includeSubDomains".encode(
+        "latin-1"
+    ),
+)
+_NO_STORE_HEADERS = ((b"cache-control", b"no-store"), (b"pragma", b"no-cache"))
+_API_VERSION_HEADERS: dict[str, tuple[bytes, bytes]] = {
+    version: (b"x-api-version", version.encode("latin-1"))
+    for version in (*settings.api_supported_versions, settings.api_latest_version)
+}
+_VERSION_DEFAULTED_HEADER = (b"x-api-version-defaulted", b"true")
+# Probe and scrape endpoints are machine-facing and skip version/security headers.
+_POLICY_EXEMPT_PATHS = frozenset({"/health", "/metrics"})
+# Must stay byte-identical to what the /health route renders.
+_HEALTH_BODY = b'{"status":"ok"}'
+_HEALTH_CONTENT_LENGTH = str(len(_HEALTH_BODY)).encode("latin-1")
+
 
 def _is_auth_path(path: str) -> bool:
-    if not path.startswith("/api/"):
-        return False
-    auth_paths = (
-        "/login",
-        "/auth/refresh",
-        "/auth/logout",
-        "/auth/oauth/",
-    )
-    return any(segment in path for segment in auth_paths)
+    return _AUTH_PATH_RE.match(path) is not None
 
 
 def _resolve_api_version(path: str, header_version: str | None) -> tuple[str, bool]:
-    supported = set(settings.api_supported_versions)
-    latest = settings.api_latest_version
-    normalized = path.strip("/")
-    path_parts = normalized.split("/") if normalized else []
-
-    if len(path_parts) >= 2 and path_parts[0] == "api" and path_parts[1] in supported:
-        return path_parts[1], False
-
-    if header_version in supported:
+    if path.startswith("/api/"):
+        # Only the segment after "/api/" matters; avoid splitting the whole path.
+        end = path.find("/", 5)
+        candidate = path[5:] if end == -1 else path[5:end]
+        if candidate in _SUPPORTED_VERSIONS:
+            return candidate, False
+
+    if header_version in _SUPPORTED_VERSIONS:
         return str(header_version), False
 
-    return latest, True
+    return _LATEST_VERSION, True
+
+
+def _build_security_header_sets() -> dict[
+    tuple[bool, bool], tuple[tuple[bytes, bytes], ...]
+]:
+    """Precompute the security headers for each (is_docs, is_https) combination."""
+    header_sets = {}
+    for is_docs in (False, True):
+        for is_https in (False, True):
+            headers = list(_STATIC_SECURITY_HEADERS)
+            if _CSP_ENABLED and not is_docs:
+                headers.append(_CSP_HEADER)
+            if _HSTS_ENABLED and is_https:
+                headers.append(_HSTS_HEADER)
+            header_sets[(is_docs, is_https)] = tuple(headers)
+    return header_sets
+
+
+_SECURITY_HEADER_SETS = _build_security_header_sets()
+
+
+def _merge_headers(
+    raw_headers: list[tuple[bytes, bytes]],
+    overrides: list[tuple[bytes, bytes]],
+    defaults: Sequence[tuple[bytes, bytes]],
+) -> list[tuple[bytes, bytes]]:
+    """Replace ``overrides`` and add ``defaults`` only where the app set none."""
+    override_names = {name for name, _ in overrides}
+    merged = [
+        (name, value)
+        for name, value in raw_headers
+        if name.lower() not in override_names
+    ]
+    present = {name.lower() for name, _ in merged}
+    merged.extend(overrides)
+    merged.extend(header for header in defaults if header[0] not in present)
+    return merged
+
+
+def _requested_api_version(scope: Scope) -> str | None:
+    # ASGI servers deliver lowercased header names, so a raw scan suffices.
+    for name, value in scope["headers"]:
+        if name == b"x-api-version":
+            return value.decode("latin-1")
+    return None
 
 
-@app.middleware("http")
-async def api_version_middleware(request: Request, call_next):
-    version, defaulted = _resolve_api_version(
-        request.url.path, request.headers.get("x-api-version")
+async def _send_health_response(send: Send) -> None:
+    """Answer liveness probes without entering routing or inner middleware."""
+    await send(
+        {
+            "type": "http.response.start",
+            "status": 200,
+            "headers": [
+                (b"content-type", b"application/json"),
+                (b"content-length", _HEALTH_CONTENT_LENGTH),
+            ],
+        }
     )
-    setattr(request.state, "api_version", version)
-    response = await call_next(request)
-    response.headers["X-API-Version"] = version
-    if defaulted:
-        response.headers["X-API-Version-Defaulted"] = "true"
-    return response
-
-
-@app.middleware("http")
-async def security_headers_middleware(request: Request, call_next):
-    response = await call_next(request)
-    if not settings.security_headers_enabled:
-        return response
+    await send({"type": "http.response.body", "body": _HEALTH_BODY})
 
-    response.headers.setdefault("X-Content-Type-Options", "nosniff")
-    response.headers.setdefault("X-Frame-Options", "DENY")
-    response.headers.setdefault("Referrer-Policy", "no-referrer")
-    response.headers.setdefault(
-        "Permissions-Policy",
-        "camera=(), geolocation=(), microphone=(), payment=(), usb=()",
-    )
-    response.headers.setdefault("Cross-Origin-Opener-Policy", "same-origin")
-    response.headers.setdefault("Cross-Origin-Resource-Policy", "same-origin")
-    response.headers.setdefault("X-Permitted-Cross-Domain-Policies", "none")
-    if settings.security_csp_enabled and request.url.path not in _DOCS_PATHS:
-        response.headers.setdefault("Content-Security-Policy", _CSP_POLICY)
-    if settings.security_hsts_enabled and request.url.scheme == "https":
-        response.headers.setdefault(
-            "Strict-Transport-Security",
-            f"max-age={settings.security_hsts_max_age_seconds}; includeSubDomains",
-        )
-    if _is_auth_path(request.url.path):
-        response.headers["Cache-Control"] = "no-store"
-        response.headers["Pragma"] = "no-cache"
-    return response
+
+class RequestPolicyMiddleware:
+    """Negotiate the API version and apply security headers in one ASGI layer."""
+
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        path = scope["path"]
+        if path == "/health" and scope["method"] == "GET":
+            await _send_health_response(send)
+            return
+        if path in _POLICY_EXEMPT_PATHS:
+            await self.app(scope, receive, send)
+            return
+
+        is_https = scope.get("scheme") == "https"
+        version, defaulted = _resolve_api_version(path, _requested_api_version(scope))
+        scope.setdefault("state", {})["api_version"] = version
+
+        overrides = [_API_VERSION_HEADERS[version]]
+        if defaulted:
+            overrides.append(_VERSION_DEFAULTED_HEADER)
+        defaults: Sequence[tuple[bytes, bytes]] = ()
+        if _SECURITY_HEADERS_ENABLED:
+            defaults = _SECURITY_HEADER_SETS[(path in _DOCS_PATHS, is_https)]
+            if _is_auth_path(path):
+                overrides.extend(_NO_STORE_HEADERS)
+
+        async def send_with_policy_headers(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                message["headers"] = _merge_headers(
+                    list(message.get("headers", ())), overrides, defaults
+                )
+            await send(message)
+
+        await self.app(scope, receive, send_with_policy_headers)
+
+
+app.add_middleware(RequestPolicyMiddleware)
 
 
 def _include_api_routers() -> None:
-    latest_prefix = f"/api/{settings.api_latest_version}"
-    if settings.api_latest_version not in settings.api_supported_versions:
+    latest_version = settings.api_latest_version
+    if latest_version not in settings.api_supported_versions:
         raise RuntimeError("api_latest_version must be included in api_supported_versions")
 
-    routers = [post.router, user.router, auth.router, vote.router, *_discover_domain_routers()]
-    for router in routers:
-        app.include_router(router, prefix=latest_prefix)
+    api_router = _build_api_router()
+    for version in dict.fromkeys(settings.api_supported_versions):
+        # Only the latest version is documented; older ones stay routable.
+        app.include_router(
+            api_router,
+            prefix=f"/api/{version}",
+            include_in_schema=version == latest_version,
+        )
 
 
-def _discover_domain_routers(package_name: str = "app.domains") -> list[APIRouter]:
+def _build_api_router() -> APIRouter:
+    """Combine core and domain routers once so each mount walks a single router."""
+    api_router = APIRouter()
+    core_routers = (post.router, user.router, auth.router, vote.router)
+    for router in (*core_routers, *_discover_domain_routers()):
+        api_router.include_router(router)
+    return api_router
+
+
+@lru_cache(maxsize=None)
+def _discover_domain_routers(
+    package_name: str = "app.domains",
+) -> tuple[APIRouter, ...]:
     try:
         package = import_module(package_name)
     except ModuleNotFoundError as exc:
         if exc.name == package_name:
-            return []
+            return ()
         raise
 
     package_paths = getattr(package, "__path__", None)
     if not package_paths:
-        return []
+        return ()
 
     routers: list[APIRouter] = []
     for module_info in sorted(iter_modules(package_paths), key=lambda item: item.name):
@@ -150,7 +317,7 @@ def _discover_domain_routers(package_name: str = "app.domains") -> list[APIRoute
         router = _load_optional_domain_router(module_path)
         if router is not None:
             routers.append(router)
-    return routers
+    return tuple(routers)
 
 
 def _load_optional_domain_router(module_path: str) -> APIRouter | None:
@@ -171,10 +338,8 @@ _include_api_routers()
 
 @app.get("/", include_in_schema=False)
 def root():
-    if settings.enable_optional_frontend:
-        index_file = frontend_dir / "index.html"
-        if index_file.exists():
-            return FileResponse(index_file)
+    if _INDEX_FILE is not None:
+        return FileResponse(_INDEX_FILE)
     return {"message": "FastAPI template API is running"}
 
 
@@ -184,8 +349,8 @@ def health():
 
 
 @app.get("/ready")
-def ready():
-    is_ready, checks = readiness_state()
+async def ready():
+    is_ready, checks = await readiness_state()
     if not is_ready:
         raise HTTPException(
             status_code=503,
@@ -195,3 +360,7 @@ def ready():
             },
         )
     return {"status": "ok", "checks": checks}
+
+
+# Build the OpenAPI document at startup instead of on the first /openapi.json hit.
+app.openapi()
@@ -1,15 +1,17 @@
-import uuid
+import secrets
+from datetime import datetime
+from typing import Any, Optional
 
 from sqlalchemy import (
     JSON,
     Boolean,
-    Column,
     ForeignKey,
+    Index,
     Integer,
     String,
     UniqueConstraint,
 )
-from sqlalchemy.orm import relationship
+from sqlalchemy.orm import Mapped, mapped_column, relationship
 from sqlalchemy.sql.expression import text
 from sqlalchemy.sql.sqltypes import TIMESTAMP
 
@@ -18,83 +20,109 @@ from .database import Base
 
 class Post(Base):
     __tablename__ = "posts"
-    id = Column(Integer, primary_key=True, nullable=False)
-    title = Column(String, nullable=False)
-    content = Column(String, nullable=False)
-    published = Column(Boolean, server_default="TRUE", nullable=False)
-    created_at = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
+    title: Mapped[str] = mapped_column(String, nullable=False)
+    content: Mapped[str] = mapped_column(String, nullable=False)
+    published: Mapped[bool] = mapped_column(
+        Boolean, server_default="TRUE", nullable=False
+    )
+    created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default=text("now()")
     )
 
-    owner_id = Column(
+    owner_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
     )
 
-    owner = relationship("User", back_populates="posts")
+    owner: Mapped["User"] = relationship(back_populates="posts")
 
 
 class User(Base):
     __tablename__ = "users"
-    id = Column(Integer, primary_key=True, nullable=False)
-    email = Column(String, nullable=False, unique=True)
-    password = Column(String, nullable=False)
-    created_at = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
+    email: Mapped[str] = mapped_column(String, nullable=False, unique=True)
+    password: Mapped[str] = mapped_column(String, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default=text("now()")
     )
-    posts = relationship("Post", back_populates="owner", cascade="all, delete-orphan")
-    refresh_tokens = relationship(
-        "RefreshToken", back_populates="user", cascade="all, delete-orphan"
+    posts: Mapped[list["Post"]] = relationship(
+        back_populates="owner", cascade="all, delete-orphan"
+    )
+    refresh_tokens: Mapped[list["RefreshToken"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan"
     )
-    oauth_accounts = relationship(
-        "OAuthAccount", back_populates="user", cascade="all, delete-orphan"
+    oauth_accounts: Mapped[list["OAuthAccount"]] = relationship(
+        back_populates="user", cascade="all, delete-orphan"
     )
 
 
 class Vote(Base):
     __tablename__ = "votes"
-    user_id = Column(
+    user_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True
     )
 
-    post_id = Column(
+    post_id: Mapped[int] = mapped_column(
         Integer, ForeignKey("posts.id", ondelete="CASCADE"), primary_key=True
     )
 
 
 class RefreshToken(Base):
     __tablename__ = "refresh_tokens"
-    id = Column(Integer, primary_key=True, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    jti = Column(String, nullable=False, unique=True, index=True)
-    revoked = Column(Boolean, nullable=False, server_default="FALSE")
-    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
-    rotated_from_jti = Column(String, nullable=True)
-    replaced_by_jti = Column(String, nullable=True)
-    created_at = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    jti: Mapped[str] = mapped_column(String, nullable=False, unique=True, index=True)
+    revoked: Mapped[bool] = mapped_column(
+        Boolean, nullable=False, server_default="FALSE"
+    )
+    expires_at: Mapped[datetime] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=False
+    )
+    rotated_from_jti: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    replaced_by_jti: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default=text("now()")
     )
 
-    user = relationship("User", back_populates="refresh_tokens")
+    user: Mapped["User"] = relationship(back_populates="refresh_tokens")
+
+
+def _new_event_key() -> str:
+    return secrets.token_hex(16)
 
 
 class OutboxEvent(Base):
     __tablename__ = "outbox_events"
-    id = Column(Integer, primary_key=True, nullable=False)
-    event_key = Column(
-        String, nullable=False, unique=True, index=True, default=lambda: str(uuid.uuid4())
-    )
-    topic = Column(String, nullable=False, index=True)
-    payload = Column(JSON, nullable=False)
-    status = Column(String, nullable=False, server_default="pending", index=True)
-    attempts = Column(Integer, nullable=False, server_default="0")
-    last_error = Column(String, nullable=True)
-    created_at = Column(
+    __table_args__ = (
+        Index(
+            "ix_outbox_events_pending_created_at",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+        ),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
+    event_key: Mapped[str] = mapped_column(
+        String, nullable=False, unique=True, index=True, default=_new_event_key
+    )
+    topic: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    payload: Mapped[Any] = mapped_column(JSON, nullable=False)
+    status: Mapped[str] = mapped_column(
+        String, nullable=False, server_default="pending", index=True
+    )
+    attempts: Mapped[int] = mapped_column(Integer, nullable=False, server_default="0")
+    last_error: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default=text("now()")
     )
-    available_at = Column(
+    available_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default=text("now()")
     )
-    processed_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    processed_at: Mapped[Optional[datetime]] = mapped_column(
+        TIMESTAMP(timezone=True), nullable=True
+    )
 
 
 class OAuthAccount(Base):
@@ -105,16 +133,18 @@ class OAuthAccount(Base):
         ),
     )
 
-    id = Column(Integer, primary_key=True, nullable=False)
-    user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
-    provider = Column(String, nullable=False, index=True)
-    provider_subject = Column(String, nullable=False)
-    provider_email = Column(String, nullable=True)
-    created_at = Column(
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, nullable=False)
+    user_id: Mapped[int] = mapped_column(
+        Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False
+    )
+    provider: Mapped[str] = mapped_column(String, nullable=False, index=True)
+    provider_subject: Mapped[str] = mapped_column(String, nullable=False)
+    provider_email: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default=text("now()")
     )
-    last_login_at = Column(
+    last_login_at: Mapped[datetime] = mapped_column(
         TIMESTAMP(timezone=True), nullable=False, server_default=text("now()")
     )
 
-    user = relationship("User", back_populates="oauth_accounts")
+    user: Mapped["User"] = relationship(back_populates="oauth_accounts")
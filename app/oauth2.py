@@ -1,14 +1,23 @@
 from __future__ import annotations
 
-import uuid
-from datetime import datetime, timedelta, timezone
+import secrets
+import threading
+import time
+from datetime import datetime, timezone
+from functools import lru_cache
 from typing import Any
 
 import jwt
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Request, status
 from fastapi.security import OAuth2PasswordBearer
 from jwt import InvalidTokenError
-from sqlalchemy.orm import Session
+from sqlalchemy import case, inspect, select, update
+from sqlalchemy.orm import (
+    InstanceState,
+    Session,
+    load_only,
+    make_transient_to_detached,
+)
 
 from . import database, models, schemas
 from .config import settings
@@ -21,11 +30,23 @@ TOKEN_ISSUER = settings.token_issuer
 TOKEN_AUDIENCE = settings.token_audience
 ACCESS_TOKEN_EXPIRE_MINUTES = settings.access_token_expire_minutes
 REFRESH_TOKEN_EXPIRE_DAYS = settings.refresh_token_expire_days
+_ACCESS_EXPIRE_SECONDS = ACCESS_TOKEN_EXPIRE_MINUTES * 60
+_REFRESH_EXPIRE_SECONDS = REFRESH_TOKEN_EXPIRE_DAYS * 86400
 
 ACCESS_TOKEN_TYPE = "access"  # nosec B105
 REFRESH_TOKEN_TYPE = "refresh"  # nosec B105
 BEARER_TOKEN_TYPE = "bearer"  # nosec B105
 
+# PyJWT already signs through OpenSSL-backed hmac/hashlib; the remaining per-call
+# cost is Python plumbing, so key bytes, algorithm list and options are built once.
+_JWT_KEY = SECRET_KEY.encode("utf-8")
+_JWT_ALGORITHMS = [ALGORITHM]
+
+
+@lru_cache(maxsize=None)
+def _decode_options(required_claims: tuple[str, ...]) -> dict[str, Any]:
+    return {"require": list(required_claims)}
+
 
 def _to_utc_datetime(exp: Any) -> datetime:
     if isinstance(exp, datetime):
@@ -35,30 +56,55 @@ def _to_utc_datetime(exp: Any) -> datetime:
     raise ValueError("Token expiry is invalid")
 
 
-def _decode_token(
-    token: str, *, required_claims: tuple[str, ...] = ("exp",)
+def encode_token(payload: dict[str, Any]) -> str:
+    return jwt.encode(payload, _JWT_KEY, algorithm=ALGORITHM)
+
+
+def decode_token(
+    token: str,
+    *,
+    required_claims: tuple[str, ...] = ("exp",),
+    audience: str = TOKEN_AUDIENCE,
 ) -> dict[str, Any]:
     payload = jwt.decode(
         token,
-        SECRET_KEY,
-        algorithms=[ALGORITHM],
-        audience=TOKEN_AUDIENCE,
+        _JWT_KEY,
+        algorithms=_JWT_ALGORITHMS,
+        audience=audience,
         issuer=TOKEN_ISSUER,
-        options={"require": list(required_claims)},
+        options=_decode_options(required_claims),
     )
     if not isinstance(payload, dict):
         raise InvalidTokenError("Invalid payload")
     return payload
 
 
+# Exceptions are built fresh per failure (a shared instance would accumulate
+# tracebacks across requests), but their read-only payloads are shared.
+_BEARER_CHALLENGE_HEADERS = {"WWW-Authenticate": "Bearer"}
+_CREDENTIALS_DETAIL = {
+    "detail": "Could not validate credentials",
+    "error_code": "invalid_credentials",
+}
+_REFRESH_CREDENTIALS_DETAIL = {
+    "detail": "Could not validate refresh token",
+    "error_code": "invalid_refresh_token",
+}
+
+
+def _build_credentials_exception() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_401_UNAUTHORIZED,
+        detail=_CREDENTIALS_DETAIL,
+        headers=_BEARER_CHALLENGE_HEADERS,
+    )
+
+
 def _build_refresh_credentials_exception() -> HTTPException:
     return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
-        detail={
-            "detail": "Could not validate refresh token",
-            "error_code": "invalid_refresh_token",
-        },
-        headers={"WWW-Authenticate": "Bearer"},
+        detail=_REFRESH_CREDENTIALS_DETAIL,
+        headers=_BEARER_CHALLENGE_HEADERS,
     )
 
 
@@ -66,11 +112,12 @@ def create_access_token(
     data: dict[str, Any], expires_minutes: int | None = None
 ) -> str:
     to_encode = data.copy()
-    expire_minutes = (
-        ACCESS_TOKEN_EXPIRE_MINUTES if expires_minutes is None else expires_minutes
+    expire_seconds = (
+        _ACCESS_EXPIRE_SECONDS if expires_minutes is None else expires_minutes * 60
     )
-    now = datetime.now(timezone.utc)
-    expire = now + timedelta(minutes=expire_minutes)
+    # JWT time claims are integer epoch seconds on the wire.
+    now = int(time.time())
+    expire = now + expire_seconds
     to_encode.update(
         {
             "iss": TOKEN_ISSUER,
@@ -78,18 +125,24 @@ def create_access_token(
             "iat": now,
             "nbf": now,
             "exp": expire,
-            "jti": uuid.uuid4().hex,
+            "jti": secrets.token_hex(16),
             "token_type": ACCESS_TOKEN_TYPE,
         }
     )
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    return encode_token(to_encode)
 
 
-def create_refresh_token(data: dict[str, Any], expires_days: int | None = None) -> str:
+def _build_refresh_token(
+    data: dict[str, Any], expires_days: int | None = None
+) -> tuple[str, str, datetime]:
+    """Encode a refresh token and return it with its jti and expiry."""
     to_encode = data.copy()
-    expire_days = REFRESH_TOKEN_EXPIRE_DAYS if expires_days is None else expires_days
-    now = datetime.now(timezone.utc)
-    expire = now + timedelta(days=expire_days)
+    expire_seconds = (
+        _REFRESH_EXPIRE_SECONDS if expires_days is None else expires_days * 86400
+    )
+    now = int(time.time())
+    expire = now + expire_seconds
+    jti = secrets.token_hex(16)
     to_encode.update(
         {
             "iss": TOKEN_ISSUER,
@@ -98,51 +151,63 @@ def create_refresh_token(data: dict[str, Any], expires_days: int | None = None)
             "nbf": now,
             "exp": expire,
             "token_type": REFRESH_TOKEN_TYPE,
-            "jti": uuid.uuid4().hex,
+            "jti": jti,
         }
     )
-    return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
+    token = encode_token(to_encode)
+    return token, jti, _to_utc_datetime(expire)
 
 
-def get_user_id_from_access_token(token: str) -> int | None:
-    try:
-        payload = _decode_token(token, required_claims=("exp", "user_id", "token_type"))
-    except InvalidTokenError:
-        return None
+def create_refresh_token(data: dict[str, Any], expires_days: int | None = None) -> str:
+    token, _, _ = _build_refresh_token(data, expires_days)
+    return token
 
-    token_type = payload.get("token_type", ACCESS_TOKEN_TYPE)
-    if token_type != ACCESS_TOKEN_TYPE:
-        return None
 
+def _access_token_data(token: str) -> schemas.TokenData | None:
     try:
-        return int(payload["user_id"])
-    except (TypeError, ValueError):
+        payload = decode_token(
+            token,
+            required_claims=("exp", "user_id", "token_type"),
+        )
+        if payload.get("token_type") != ACCESS_TOKEN_TYPE:
+            return None
+
+        return schemas.TokenData(
+            id=int(payload["user_id"]),
+            jti=payload.get("jti"),
+            exp=payload["exp"],
+        )
+    except (InvalidTokenError, ValueError, TypeError):
         return None
 
 
+def request_access_token_data(request: Request, token: str) -> schemas.TokenData | None:
+    """Decode ``token`` at most once per request.
+
+    The rate limiter and ``get_current_user`` both need the bearer token's claims;
+    the first caller stores the result on ``request.state`` for the other.
+    """
+    cached = getattr(request.state, "access_token_data", None)
+    if cached is not None and cached[0] == token:
+        return cached[1]
+    token_data = _access_token_data(token)
+    request.state.access_token_data = (token, token_data)
+    return token_data
+
+
 def verify_access_token(
     token: str, credentials_exception: HTTPException
 ) -> schemas.TokenData:
-    try:
-        payload = _decode_token(
-            token,
-            required_claims=("exp", "user_id", "token_type"),
-        )
-        token_type = payload.get("token_type")
-        if token_type != ACCESS_TOKEN_TYPE:
-            raise credentials_exception
-
-        token_data = schemas.TokenData(id=int(payload["user_id"]))
-    except (InvalidTokenError, ValueError, TypeError):
+    token_data = _access_token_data(token)
+    if token_data is None:
         raise credentials_exception
-
     return token_data
 
 
 def verify_refresh_token(token: str) -> dict[str, Any]:
     credentials_exception = _build_refresh_credentials_exception()
     try:
-        payload = _decode_token(
+        payload = decode_token(
             token,
             required_claims=("exp", "user_id", "token_type", "jti"),
         )
@@ -177,13 +242,12 @@ def _persist_refresh_token(
 
 def issue_token_pair(db: Session, user_id: int) -> schemas.Token:
     access_token = create_access_token(data={"user_id": user_id})
-    refresh_token = create_refresh_token(data={"user_id": user_id})
-    payload = verify_refresh_token(refresh_token)
+    refresh_token, jti, expires_at = _build_refresh_token(data={"user_id": user_id})
     _persist_refresh_token(
         db,
         user_id=user_id,
-        jti=payload["jti"],
-        expires_at=payload["exp"],
+        jti=jti,
+        expires_at=expires_at,
     )
     db.commit()
     return schemas.Token(
@@ -195,28 +259,39 @@ def issue_token_pair(db: Session, user_id: int) -> schemas.Token:
 
 def rotate_refresh_token(db: Session, refresh_token: str) -> schemas.Token:
     payload = verify_refresh_token(refresh_token)
-    existing_token = (
-        db.query(models.RefreshToken)
-        .filter(models.RefreshToken.jti == payload["jti"])
-        .first()
+    new_refresh_token, new_jti, new_expires_at = _build_refresh_token(
+        data={"user_id": payload["user_id"]}
     )
-    if existing_token is None or existing_token.revoked:
+    # One atomic statement revokes the presented token: live tokens are linked to
+    # their replacement, expired ones are just revoked. A revoked, unknown or
+    # concurrently rotated token matches no row.
+    still_valid = models.RefreshToken.expires_at > datetime.now(timezone.utc)
+    outcome = db.execute(
+        update(models.RefreshToken)
+        .where(
+            models.RefreshToken.jti == payload["jti"],
+            models.RefreshToken.revoked.is_(False),
+        )
+        .values(
+            revoked=True,
+            replaced_by_jti=case(
+                (still_valid, new_jti), else_=models.RefreshToken.replaced_by_jti
+            ),
+        )
+        .returning(still_valid.label("rotated"))
+    ).first()
+    if outcome is None:
         raise _build_refresh_credentials_exception()
-    if existing_token.expires_at <= datetime.now(timezone.utc):
-        existing_token.revoked = True  # type: ignore[assignment]
+    if not outcome.rotated:
         db.commit()
         raise _build_refresh_credentials_exception()
 
-    existing_token.revoked = True  # type: ignore[assignment]
     access_token = create_access_token(data={"user_id": payload["user_id"]})
-    new_refresh_token = create_refresh_token(data={"user_id": payload["user_id"]})
-    new_payload = verify_refresh_token(new_refresh_token)
-    existing_token.replaced_by_jti = new_payload["jti"]
     _persist_refresh_token(
         db,
         user_id=payload["user_id"],
-        jti=new_payload["jti"],
-        expires_at=new_payload["exp"],
+        jti=new_jti,
+        expires_at=new_expires_at,
         rotated_from_jti=payload["jti"],
     )
     db.commit()
@@ -237,25 +312,78 @@ def revoke_refresh_token(db: Session, refresh_token: str) -> bool:
     if existing_token is None:
         return False
     if not existing_token.revoked:
-        existing_token.revoked = True  # type: ignore[assignment]
+        existing_token.revoked = True
         db.commit()
     return True
 
 
-def get_current_user(
-    token: str = Depends(oauth2_scheme), db: Session = Depends(database.get_db)
-) -> models.User:
-    credentials_exception = HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail={
-            "detail": "Could not validate credentials",
-            "error_code": "invalid_credentials",
-        },
-        headers={"WWW-Authenticate": "Bearer"},
+# Per-process cache of authenticated users keyed by access-token jti. Entries live
+# for at most AUTH_USER_CACHE_TTL_SECONDS and never beyond the token's own expiry.
+_user_cache: dict[str, tuple[float, models.User]] = {}
+_user_cache_lock = threading.Lock()
+
+
+def clear_user_cache() -> None:
+    with _user_cache_lock:
+        _user_cache.clear()
+
+
+def _get_cached_user(jti: str | None) -> models.User | None:
+    if jti is None:
+        return None
+    entry = _user_cache.get(jti)
+    if entry is None:
+        return None
+    if entry[0] <= time.monotonic():
+        _user_cache.pop(jti, None)
+        return None
+    return entry[1]
+
+
+def _cache_user(token_data: schemas.TokenData, user: models.User) -> None:
+    max_entries = settings.auth_user_cache_max_entries
+    if token_data.jti is None or token_data.exp is None or max_entries <= 0:
+        return
+    ttl = min(settings.auth_user_cache_ttl_seconds, token_data.exp - time.time())
+    if ttl <= 0:
+        return
+
+    state: InstanceState[models.User] = inspect(user)
+    snapshot = models.User(
+        **{
+            attr.key: getattr(user, attr.key)
+            for attr in state.mapper.column_attrs
+            if attr.key not in state.unloaded
+        }
     )
+    make_transient_to_detached(snapshot)
+    with _user_cache_lock:
+        while len(_user_cache) >= max_entries:
+            _user_cache.pop(next(iter(_user_cache)))
+        _user_cache[token_data.jti] = (time.monotonic() + ttl, snapshot)
+
 
-    token_data = verify_access_token(token, credentials_exception)
-    user = db.query(models.User).filter(models.User.id == token_data.id).first()
+def get_current_user(
+    request: Request,
+    token: str = Depends(oauth2_scheme),
+    db: Session = Depends(database.get_db),
+) -> models.User:
+    token_data = request_access_token_data(request, token)
+    if token_data is None:
+        raise _build_credentials_exception()
+    cached_user = _get_cached_user(token_data.jti)
+    if cached_user is not None:
+        # Attach the snapshot to this request's session without a SELECT.
+        return db.merge(cached_user, load=False)
+
+    # The password hash is deferred: request handlers never need it, and it
+    # then stays out of the per-token cache as well.
+    user = db.scalars(
+        select(models.User)
+        .options(load_only(models.User.id, models.User.email, models.User.created_at))
+        .where(models.User.id == token_data.id)
+    ).first()
     if user is None:
-        raise credentials_exception
+        raise _build_credentials_exception()
+    _cache_user(token_data, user)
     return user
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import logging
 from typing import Any
 
@@ -7,6 +8,20 @@ from fastapi import FastAPI
 
 from .config import settings
 
+logger = logging.getLogger(__name__)
+
+_LOG_FORMAT = "%(asctime)s %(levelname)s %(name)s %(message)s"
+
+# Resolved once at import; the heavier optional integrations below stay lazy so
+# disabled features cost nothing at startup.
+_LOG_FORMATTER_CLASS: type[logging.Formatter]
+try:
+    from pythonjsonlogger.json import JsonFormatter
+
+    _LOG_FORMATTER_CLASS = JsonFormatter
+except ImportError:
+    _LOG_FORMATTER_CLASS = logging.Formatter
+
 
 def _route_exists(app: FastAPI, path: str) -> bool:
     return any(getattr(route, "path", None) == path for route in app.routes)
@@ -18,16 +33,7 @@ def configure_structured_logging() -> bool:
         return False
 
     handler = logging.StreamHandler()
-    try:
-        from pythonjsonlogger.json import JsonFormatter
-
-        handler.setFormatter(
-            JsonFormatter("%(asctime)s %(levelname)s %(name)s %(message)s")
-        )
-    except ImportError:
-        handler.setFormatter(
-            logging.Formatter("%(asctime)s %(levelname)s %(name)s %(message)s")
-        )
+    handler.setFormatter(_LOG_FORMATTER_CLASS(_LOG_FORMAT))
 
     root.handlers = [handler]
     root.setLevel(logging.INFO)
@@ -104,6 +110,16 @@ def configure_sentry() -> bool:
     return True
 
 
+def warn_if_default_event_loop() -> bool:
+    loop_module = type(asyncio.get_running_loop()).__module__
+    if loop_module.startswith("uvloop"):
+        return False
+    logger.warning(
+        "Serving on the %s event loop; start uvicorn with --loop uvloop", loop_module
+    )
+    return True
+
+
 def configure_observability(app: FastAPI) -> dict[str, Any]:
     return {
         "logging": configure_structured_logging(),
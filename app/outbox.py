@@ -1,11 +1,13 @@
 from __future__ import annotations
 
+from collections.abc import Iterable
 from datetime import datetime, timezone
 from typing import Any
 
+from sqlalchemy import ColumnElement, Insert, insert, literal, select
 from sqlalchemy.orm import Session
 
-from .models import OutboxEvent
+from .models import OutboxEvent, _new_event_key
 
 
 def enqueue_outbox_event(
@@ -16,23 +18,53 @@ def enqueue_outbox_event(
     return event
 
 
+def enqueue_outbox_events(
+    db: Session, events: Iterable[tuple[str, dict[str, Any]]]
+) -> int:
+    """Queue many events with one executemany INSERT instead of one per row."""
+    rows = [{"topic": topic, "payload": payload} for topic, payload in events]
+    if rows:
+        db.execute(insert(OutboxEvent), rows)
+    return len(rows)
+
+
+def outbox_event_insert(topic: str, payload: ColumnElement[Any]) -> Insert:
+    """Build an INSERT queueing one event whose payload is a SQL expression.
+
+    Meant to be wrapped in a CTE so the event is written by the same statement
+    as the row it describes.
+    """
+    return insert(OutboxEvent).from_select(
+        ["event_key", "topic", "payload"],
+        select(literal(_new_event_key()), literal(topic), payload),
+        include_defaults=False,
+    )
+
+
 def get_pending_outbox_events(db: Session, limit: int = 100) -> list[OutboxEvent]:
-    return (
-        db.query(OutboxEvent)
-        .filter(OutboxEvent.status == "pending")
-        .order_by(OutboxEvent.created_at.asc())
-        .limit(limit)
-        .all()
+    """Claim up to ``limit`` pending events for the current transaction.
+
+    Rows are locked with ``FOR UPDATE SKIP LOCKED`` so concurrent dispatchers
+    pull disjoint batches; the locks are released when the caller commits.
+    """
+    return list(
+        db.scalars(
+            select(OutboxEvent)
+            .where(OutboxEvent.status == "pending")
+            .order_by(OutboxEvent.created_at.asc())
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
     )
 
 
 def mark_outbox_event_completed(db: Session, event: OutboxEvent) -> None:
-    event.status = "completed"  # type: ignore[assignment]
-    event.processed_at = datetime.now(timezone.utc)  # type: ignore[assignment]
+    event.status = "completed"
+    event.processed_at = datetime.now(timezone.utc)
 
 
 def mark_outbox_event_failed(db: Session, event: OutboxEvent, error: str) -> None:
-    event.status = "failed"  # type: ignore[assignment]
-    event.last_error = error  # type: ignore[assignment]
-    event.attempts = int(event.attempts) + 1  # type: ignore[assignment]
-    event.processed_at = datetime.now(timezone.utc)  # type: ignore[assignment]
+    event.status = "failed"
+    event.last_error = error
+    event.attempts = int(event.attempts) + 1
+    event.processed_at = datetime.now(timezone.utc)
@@ -3,24 +3,31 @@ from __future__ import annotations
 import hashlib
 import ipaddress
 import time
-from dataclasses import dataclass
-from typing import Any, Callable, cast
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import Any, Callable, Coroutine, Sequence, TypeVar, cast
 
-from fastapi import Depends, HTTPException, Request, Response, status
+from fastapi import HTTPException, Request, Response, status
+from fastapi.routing import APIRoute
 from redis import Redis
+from redis.commands.core import Script
 from redis.exceptions import RedisError
+from starlette.concurrency import run_in_threadpool
 
 from . import oauth2
 from .config import settings
 from .redis_client import get_redis_client
 
+# Increments every KEYS[i] (expiring it after ARGV[i] seconds) in one round-trip
+# and returns the count per key. EXPIRE ... NX needs Redis 7 and only sets the
+# TTL on the first hit of a window.
 _RATE_LIMIT_LUA = """
-local current = redis.call("INCR", KEYS[1])
-if current == 1 then
-  redis.call("EXPIRE", KEYS[1], ARGV[1])
+local counts = {}
+for i, key in ipairs(KEYS) do
+  counts[i] = redis.call("INCR", key)
+  redis.call("EXPIRE", key, ARGV[i], "NX")
 end
-local ttl = redis.call("TTL", KEYS[1])
-return {current, ttl}
+return counts
 """
 
 
@@ -29,8 +36,20 @@ class RateLimitPolicy:
     name: str
     limit: int
     window_seconds: int
+    key_prefix: bytes = field(init=False, repr=False, compare=False)
+    window_arg: bytes = field(init=False, repr=False, compare=False)
+    limit_header: tuple[bytes, bytes] = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "key_prefix", f"rl:{self.name}:".encode("utf-8"))
+        # Script ARGV value, pre-encoded like the key so redis-py sends it as is.
+        object.__setattr__(self, "window_arg", b"%d" % self.window_seconds)
+        object.__setattr__(
+            self, "limit_header", (b"x-ratelimit-limit", b"%d" % self.limit)
+        )
 
 
+@lru_cache(maxsize=1)
 def _load_policies() -> dict[str, RateLimitPolicy]:
     return {
         "auth_login": RateLimitPolicy(
@@ -60,52 +79,83 @@ def _client_ip(request: Request) -> str:
     if settings.trust_proxy_headers:
         xff = request.headers.get("x-forwarded-for")
         if xff:
-            first_hop = xff.split(",")[0].strip()
+            first_hop = xff.partition(",")[0].strip()
             try:
                 ipaddress.ip_address(first_hop)
                 return first_hop
             except ValueError:
                 pass
-    if request.client is None:
-        return "unknown"
-    return request.client.host
+    client = request.scope.get("client")
+    return client[0] if client else "unknown"
 
 
 def _principal_for_request(request: Request) -> str:
     auth_header = request.headers.get("authorization", "")
     if auth_header.lower().startswith("bearer "):
         token = auth_header.split(" ", 1)[1].strip()
-        user_id = oauth2.get_user_id_from_access_token(token)
-        if user_id is not None:
-            return f"user:{user_id}"
+        token_data = oauth2.request_access_token_data(request, token)
+        if token_data is not None:
+            return f"user:{token_data.id}"
     return f"ip:{_client_ip(request)}"
 
 
+@lru_cache(maxsize=4096)
+def _principal_hash(principal: str) -> bytes:
+    # Non-cryptographic use: the digest only buckets the principal into a key.
+    digest = hashlib.blake2b(principal.encode("utf-8"), digest_size=8)
+    return digest.hexdigest().encode("ascii")
+
+
 def build_rate_limit_key(
     policy: RateLimitPolicy, principal: str, now_seconds: float | None = None
-) -> str:
+) -> bytes:
+    # Keys are built as bytes so redis-py passes them through without encoding.
     epoch_seconds = int(now_seconds or time.time())
     window_bucket = epoch_seconds // policy.window_seconds
-    principal_hash = hashlib.sha256(principal.encode("utf-8")).hexdigest()[:16]
-    return f"rl:{policy.name}:{window_bucket}:{principal_hash}"
+    return b"%b%d:%b" % (policy.key_prefix, window_bucket, _principal_hash(principal))
 
 
 class RedisRateLimiter:
     def __init__(self, redis_factory: Callable[[], Redis] = get_redis_client):
         self._redis_factory = redis_factory
+        self._script: Script | None = None
+
+    def _script_for(self, redis_client: Redis) -> Script:
+        # Script runs EVALSHA and falls back to SCRIPT LOAD on NOSCRIPT, so the Lua
+        # source only crosses the wire once per Redis server.
+        script = self._script
+        if script is None or script.registered_client is not redis_client:
+            script = self._script = redis_client.register_script(_RATE_LIMIT_LUA)
+        return script
 
     def check(self, policy: RateLimitPolicy, principal: str) -> tuple[bool, int, int]:
-        key = build_rate_limit_key(policy, principal)
+        return self.check_many([policy], principal)[0]
+
+    def check_many(
+        self, policies: Sequence[RateLimitPolicy], principal: str
+    ) -> list[tuple[bool, int, int]]:
+        """Count one hit against every policy with a single script call."""
         redis_client = self._redis_factory()
-        raw_result = redis_client.eval(  # type: ignore[arg-type]
-            _RATE_LIMIT_LUA, 1, key, str(policy.window_seconds)
+        now_seconds = int(time.time())
+        raw_result = self._script_for(redis_client)(
+            keys=[
+                build_rate_limit_key(policy, principal, now_seconds)
+                for policy in policies
+            ],
+            args=[policy.window_arg for policy in policies],
+            client=redis_client,
         )
-        result = cast(list[Any], raw_result)
-        count = int(result[0])
-        ttl = max(int(result[1]), 0)
-        remaining = max(policy.limit - count, 0)
-        allowed = count <= policy.limit
-        return allowed, remaining, ttl
+        counts = cast(list[Any], raw_result)
+        checks = []
+        for policy, raw_count in zip(policies, counts):
+            count = int(raw_count)
+            # Windows are fixed buckets, so the reset time follows from the clock
+            # without asking Redis for the key's TTL.
+            retry_after = policy.window_seconds - now_seconds % policy.window_seconds
+            checks.append(
+                (count <= policy.limit, max(policy.limit - count, 0), retry_after)
+            )
+        return checks
 
 
 _rate_limiter = RedisRateLimiter()
@@ -116,45 +166,125 @@ def set_rate_limiter(rate_limiter: RedisRateLimiter) -> None:
     _rate_limiter = rate_limiter
 
 
-def _should_rate_limit() -> bool:
+def _rate_limiting_configured() -> bool:
     return settings.enable_optional_rate_limiting and settings.rate_limit_enabled
 
 
-def rate_limit_dependency(policy_name: str):
+# Snapshot of the two settings switches, read on every rate-limited request.
+_rate_limit_enabled = _rate_limiting_configured()
+
+
+def refresh_rate_limit_flag() -> None:
+    """Re-read the rate-limit switches after settings change."""
+    set_rate_limit_enabled(_rate_limiting_configured())
+
+
+def set_rate_limit_enabled(enabled: bool) -> None:
+    global _rate_limit_enabled
+    _rate_limit_enabled = enabled
+
+
+def _should_rate_limit() -> bool:
+    return _rate_limit_enabled
+
+
+def _resolve_policy(policy_name: str) -> RateLimitPolicy:
     policies = _load_policies()
     if policy_name not in policies:
         raise ValueError(f"Unknown rate limit policy: {policy_name}")
-    policy = policies[policy_name]
-
-    def _dependency(request: Request, response: Response) -> None:
-        if not _should_rate_limit():
-            return
-
-        principal = _principal_for_request(request)
-        try:
-            allowed, remaining, retry_after = _rate_limiter.check(policy, principal)
-        except RedisError:
-            if settings.rate_limit_fail_open:
-                return
-            raise HTTPException(
-                status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
-                detail={
-                    "detail": "Rate limiting backend is unavailable",
-                    "error_code": "rate_limit_backend_unavailable",
-                },
-            )
+    return policies[policy_name]
 
-        response.headers["X-RateLimit-Limit"] = str(policy.limit)
-        response.headers["X-RateLimit-Remaining"] = str(remaining)
-        response.headers["X-RateLimit-Reset"] = str(retry_after)
-        if not allowed:
-            raise HTTPException(
-                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
-                detail={
-                    "detail": "Rate limit exceeded",
-                    "error_code": "rate_limit_exceeded",
-                },
-                headers={"Retry-After": str(max(retry_after, 1))},
-            )
 
-    return Depends(_dependency)
+def _backend_unavailable() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail={
+            "detail": "Rate limiting backend is unavailable",
+            "error_code": "rate_limit_backend_unavailable",
+        },
+    )
+
+
+def _rate_limit_exceeded(retry_after: int) -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={
+            "detail": "Rate limit exceeded",
+            "error_code": "rate_limit_exceeded",
+        },
+        headers={"Retry-After": str(max(retry_after, 1))},
+    )
+
+
+def _rate_limit_headers(
+    policy: RateLimitPolicy, remaining: int, retry_after: int
+) -> list[tuple[bytes, bytes]]:
+    # Raw (lower-cased) header pairs: callers extend Response.raw_headers in one
+    # step instead of going through MutableHeaders.__setitem__ per header.
+    return [
+        policy.limit_header,
+        (b"x-ratelimit-remaining", b"%d" % remaining),
+        (b"x-ratelimit-reset", b"%d" % retry_after),
+    ]
+
+
+def _enforce_rate_limit(
+    request: Request, policy: RateLimitPolicy
+) -> list[tuple[bytes, bytes]]:
+    principal = _principal_for_request(request)
+    try:
+        allowed, remaining, retry_after = _rate_limiter.check(policy, principal)
+    except RedisError:
+        if settings.rate_limit_fail_open:
+            return []
+        raise _backend_unavailable()
+
+    if not allowed:
+        raise _rate_limit_exceeded(retry_after)
+    return _rate_limit_headers(policy, remaining, retry_after)
+
+
+_Endpoint = TypeVar("_Endpoint", bound=Callable[..., Any])
+
+
+def rate_limited(policy_name: str) -> Callable[[_Endpoint], _Endpoint]:
+    """Mark an endpoint to be checked against ``policy_name`` by RateLimitedRoute.
+
+    Apply it below the router decorator so the route sees the marked function.
+    """
+    policy = _resolve_policy(policy_name)
+
+    def _mark(endpoint: _Endpoint) -> _Endpoint:
+        setattr(endpoint, "_rate_limit_policy", policy)
+        return endpoint
+
+    return _mark
+
+
+class RateLimitedRoute(APIRoute):
+    """Route that enforces an endpoint's ``rate_limited`` policy before dispatch.
+
+    The check runs ahead of dependency resolution, so rejected requests never
+    open a database session or parse the body, and no per-request dependency is
+    solved just to count the hit.
+    """
+
+    def get_route_handler(self) -> Callable[[Request], Coroutine[Any, Any, Response]]:
+        handler = super().get_route_handler()
+        policy: RateLimitPolicy | None = getattr(
+            self.endpoint, "_rate_limit_policy", None
+        )
+        if policy is None:
+            return handler
+
+        async def _rate_limited_handler(request: Request) -> Response:
+            if not _should_rate_limit():
+                return await handler(request)
+            # The Redis client is blocking, so the check runs in the threadpool
+            # like a sync dependency would.
+            headers = await run_in_threadpool(_enforce_rate_limit, request, policy)
+            response = await handler(request)
+            response.raw_headers.extend(headers)
+            return response
+
+        return _rate_limited_handler
@@ -2,7 +2,7 @@ from __future__ import annotations
 
 from functools import lru_cache
 
-from redis import Redis
+from redis import ConnectionPool, Redis
 from redis.exceptions import RedisError
 
 from .config import settings
@@ -10,7 +10,14 @@ from .config import settings
 
 @lru_cache(maxsize=1)
 def get_redis_client() -> Redis:
-    return Redis.from_url(settings.redis_url, decode_responses=True)
+    # Replies are left undecoded: callers only read integers and PING results.
+    pool = ConnectionPool.from_url(
+        settings.redis_url,
+        max_connections=settings.redis_max_connections,
+        socket_keepalive=True,
+        health_check_interval=settings.redis_health_check_interval_seconds,
+    )
+    return Redis(connection_pool=pool)
 
 
 def reset_redis_client() -> None:
@@ -1,38 +1,43 @@
 from __future__ import annotations
 
 import secrets
+from functools import lru_cache
 from typing import Any, Optional, Union
 
+import orjson
 from fastapi import APIRouter, Depends, Form, HTTPException, Request, Response, status
 from fastapi.responses import RedirectResponse
 from fastapi.security.oauth2 import OAuth2PasswordRequestForm
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
 from .. import database, models, oauth2, oauth_external, schemas, utils
-from ..rate_limit import rate_limit_dependency
+from ..rate_limit import RateLimitedRoute, rate_limited
 
-router = APIRouter(tags=["Authentication"])
+router = APIRouter(tags=["Authentication"], route_class=RateLimitedRoute)
 _DUMMY_PASSWORD_HASH = utils.hash(secrets.token_urlsafe(32))
 
 
 @router.post("/login", response_model=schemas.Token)
+@rate_limited("auth_login")
 def login(
-    _: None = rate_limit_dependency("auth_login"),
     user_credentials: OAuth2PasswordRequestForm = Depends(),
     db: Session = Depends(database.get_db),
 ):
     normalized_username = user_credentials.username.strip().lower()
-    user = (
-        db.query(models.User).filter(models.User.email == normalized_username).first()
-    )
-
-    if not user:
-        utils.verify(user_credentials.password, _DUMMY_PASSWORD_HASH)
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN, detail="Invalid Credentials"
+    # Emails are stored normalized, so the unique index on users.email serves this
+    # lookup; only the two columns login needs are fetched, without ORM hydration.
+    user = db.execute(
+        select(models.User.id, models.User.password).where(
+            models.User.email == normalized_username
         )
+    ).first()
 
-    if not utils.verify(user_credentials.password, user.password):
+    # Exactly one bcrypt verify runs whether or not the user exists, so unknown
+    # emails cost (and take) the same as wrong passwords.
+    stored_hash = user.password if user is not None else _DUMMY_PASSWORD_HASH
+    password_ok = utils.verify(user_credentials.password, stored_hash)
+    if user is None or not password_ok:
         raise HTTPException(
             status_code=status.HTTP_403_FORBIDDEN, detail="Invalid Credentials"
         )
@@ -41,36 +46,50 @@ def login(
 
 
 @router.post("/auth/refresh", response_model=schemas.Token)
+@rate_limited("auth_login")
 def refresh(
     payload: schemas.RefreshTokenRequest,
-    _: None = rate_limit_dependency("auth_login"),
     db: Session = Depends(database.get_db),
 ):
     return oauth2.rotate_refresh_token(db, payload.refresh_token)
 
 
 @router.post("/auth/logout", status_code=status.HTTP_204_NO_CONTENT)
+@rate_limited("auth_login")
 def logout(
     payload: schemas.RefreshTokenRequest,
-    _: None = rate_limit_dependency("auth_login"),
     db: Session = Depends(database.get_db),
 ):
     oauth2.revoke_refresh_token(db, payload.refresh_token)
     return Response(status_code=status.HTTP_204_NO_CONTENT)
 
 
-@router.get("/auth/oauth/providers", response_model=schemas.OAuthProvidersResponse)
-def oauth_providers():
+@lru_cache(maxsize=8)
+def _oauth_providers_body(provider_names: tuple[str, ...]) -> bytes:
     providers = [
         schemas.OAuthProvider(
-            provider=provider.provider,
-            display_name=provider.display_name,
-            start_url=f"/api/v1/auth/oauth/{provider.provider}/start",
-            link_start_url=f"/api/v1/auth/oauth/{provider.provider}/link/start",
+            provider=name,
+            display_name=oauth_external.get_provider(name).display_name,
+            start_url=f"/api/v1/auth/oauth/{name}/start",
+            link_start_url=f"/api/v1/auth/oauth/{name}/link/start",
         )
-        for provider in oauth_external.list_enabled_providers()
+        for name in provider_names
     ]
-    return schemas.OAuthProvidersResponse(providers=providers)
+    return orjson.dumps(
+        schemas.OAuthProvidersResponse(providers=providers).model_dump(mode="json")
+    )
+
+
+@router.get("/auth/oauth/providers", response_model=schemas.OAuthProvidersResponse)
+def oauth_providers():
+    # The body only depends on which providers are enabled, so it is serialized
+    # once per distinct set and returned without response-model revalidation.
+    enabled = tuple(
+        provider.provider for provider in oauth_external.list_enabled_providers()
+    )
+    return Response(
+        content=_oauth_providers_body(enabled), media_type="application/json"
+    )
 
 
 def _oauth_error_message(error: Optional[str], error_description: Optional[str]) -> str:
@@ -122,7 +141,7 @@ async def _handle_oauth_callback(
             },
         )
 
-    callback_result = oauth_external.complete_oauth_callback(
+    callback_result = await oauth_external.complete_oauth_callback(
         db,
         request,
         provider=provider,
@@ -161,11 +180,11 @@ async def _handle_oauth_callback(
 
 
 @router.get("/auth/oauth/{provider}/start")
+@rate_limited("auth_login")
 def oauth_start(
     provider: str,
     request: Request,
     redirect_to_frontend: bool = True,
-    _: None = rate_limit_dependency("auth_login"),
 ):
     authorize_url = oauth_external.build_authorization_url(
         provider,
@@ -179,11 +198,11 @@ def oauth_start(
     "/auth/oauth/{provider}/link/start",
     response_model=schemas.OAuthStartResponse,
 )
+@rate_limited("auth_login")
 def oauth_link_start(
     provider: str,
     request: Request,
     redirect_to_frontend: bool = True,
-    _: None = rate_limit_dependency("auth_login"),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
     authorization_url = oauth_external.build_authorization_url(
@@ -199,6 +218,7 @@ def oauth_link_start(
     "/auth/oauth/{provider}/callback",
     response_model=Union[schemas.Token, schemas.OAuthLinkResponse],
 )
+@rate_limited("auth_login")
 async def oauth_callback_get(
     provider: str,
     request: Request,
@@ -206,7 +226,6 @@ async def oauth_callback_get(
     code: Optional[str] = None,
     error: Optional[str] = None,
     error_description: Optional[str] = None,
-    _: None = rate_limit_dependency("auth_login"),
     db: Session = Depends(database.get_db),
 ):
     return await _handle_oauth_callback(
@@ -224,6 +243,7 @@ async def oauth_callback_get(
     "/auth/oauth/{provider}/callback",
     response_model=Union[schemas.Token, schemas.OAuthLinkResponse],
 )
+@rate_limited("auth_login")
 async def oauth_callback_post(
     provider: str,
     request: Request,
@@ -231,7 +251,6 @@ async def oauth_callback_post(
     code: Optional[str] = Form(default=None),
     error: Optional[str] = Form(default=None),
     error_description: Optional[str] = Form(default=None),
-    _: None = rate_limit_dependency("auth_login"),
     db: Session = Depends(database.get_db),
 ):
     return await _handle_oauth_callback(
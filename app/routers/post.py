@@ -7,14 +7,14 @@ from sqlalchemy.orm import Session
 from .. import models, oauth2, schemas
 from ..database import get_db
 from ..outbox import enqueue_outbox_event
-from ..rate_limit import rate_limit_dependency
+from ..rate_limit import RateLimitedRoute, rate_limited
 
-router = APIRouter(prefix="/posts", tags=["Posts"])
+router = APIRouter(prefix="/posts", tags=["Posts"], route_class=RateLimitedRoute)
 
 
 @router.get("/", response_model=List[schemas.PostOut])
+@rate_limited("api_read")
 def get_posts(
-    _: None = rate_limit_dependency("api_read"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
     limit: int = Query(default=10, ge=1, le=100),
@@ -49,9 +49,9 @@ def get_posts(
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=schemas.Post)
+@rate_limited("api_write")
 def create_posts(
     post: schemas.PostCreate,
-    _: None = rate_limit_dependency("api_write"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
@@ -74,9 +74,9 @@ def create_posts(
 
 
 @router.get("/{id}", response_model=schemas.PostOut)
+@rate_limited("api_read")
 def get_post(
     id: int,
-    _: None = rate_limit_dependency("api_read"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
@@ -101,9 +101,9 @@ def get_post(
 
 
 @router.delete("/{id}", status_code=status.HTTP_204_NO_CONTENT)
+@rate_limited("api_write")
 def delete_post(
     id: int,
-    _: None = rate_limit_dependency("api_write"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
@@ -137,10 +137,10 @@ def delete_post(
 
 
 @router.put("/{id}", response_model=schemas.Post)
+@rate_limited("api_write")
 def update_post(
     id: int,
     updated_post: schemas.PostCreate,
-    _: None = rate_limit_dependency("api_write"),
     db: Session = Depends(get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
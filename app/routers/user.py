@@ -1,33 +1,41 @@
 from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import func, insert, literal, select
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
 
 from .. import models, oauth2, schemas, utils
 from ..database import get_db
-from ..outbox import enqueue_outbox_event
-from ..rate_limit import rate_limit_dependency
+from ..outbox import outbox_event_insert
+from ..rate_limit import RateLimitedRoute, rate_limited
 
-router = APIRouter(prefix="/users", tags=["Users"])
+router = APIRouter(prefix="/users", tags=["Users"], route_class=RateLimitedRoute)
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED, response_model=schemas.UserOut)
+@rate_limited("auth_register")
 def create_user(
     user: schemas.UserCreate,
-    _: None = rate_limit_dependency("auth_register"),
     db: Session = Depends(get_db),
 ):
     # hash the password - user.password
     hashed_password = utils.hash(user.password)
-    user.password = hashed_password
-    new_user = models.User(**user.model_dump())
-    db.add(new_user)
+    # Insert the user and its user.created outbox event in one statement: the
+    # outbox row is written from a data-modifying CTE and the user columns come
+    # back through RETURNING, so no flush/refresh round-trips are needed.
+    new_user = (
+        insert(models.User)
+        .values(email=user.email, password=hashed_password)
+        .returning(models.User.id, models.User.email, models.User.created_at)
+        .cte("new_user")
+    )
+    user_created_event = outbox_event_insert(
+        "user.created",
+        func.json_build_object(
+            literal("user_id"), new_user.c.id, literal("email"), new_user.c.email
+        ),
+    ).cte("user_created_event")
     try:
-        db.flush()
-        enqueue_outbox_event(
-            db,
-            topic="user.created",
-            payload={"user_id": new_user.id, "email": new_user.email},
-        )
+        created = db.execute(select(new_user).add_cte(user_created_event)).one()
         db.commit()
     except IntegrityError:
         db.rollback()
@@ -35,8 +43,7 @@ def create_user(
             status_code=status.HTTP_409_CONFLICT,
             detail="Email is already registered",
         )
-    db.refresh(new_user)
-    return new_user
+    return created._mapping
 
 
 @router.get("/{id}", response_model=schemas.UserOut)
@@ -3,15 +3,15 @@ from sqlalchemy.orm import Session
 
 from .. import database, models, oauth2, schemas
 from ..outbox import enqueue_outbox_event
-from ..rate_limit import rate_limit_dependency
+from ..rate_limit import RateLimitedRoute, rate_limited
 
-router = APIRouter(prefix="/vote", tags=["Vote"])
+router = APIRouter(prefix="/vote", tags=["Vote"], route_class=RateLimitedRoute)
 
 
 @router.post("/", status_code=status.HTTP_201_CREATED)
+@rate_limited("api_write")
 def vote(
     vote: schemas.Vote,
-    _: None = rate_limit_dependency("api_write"),
     db: Session = Depends(database.get_db),
     current_user: models.User = Depends(oauth2.get_current_user),
 ):
@@ -1,7 +1,33 @@
+import re
 from datetime import datetime
 from typing import Annotated, Optional
 
-from pydantic import BaseModel, ConfigDict, EmailStr, Field, field_validator
+from pydantic import (
+    AfterValidator,
+    BaseModel,
+    ConfigDict,
+    EmailStr,
+    Field,
+    field_validator,
+)
+
+_EMAIL_SHAPE = re.compile(r"^[^@\s]+@[^@\s]+\.[^@\s]+$")
+
+
+def _check_email_shape(value: str) -> str:
+    if _EMAIL_SHAPE.match(value) is None:
+        raise ValueError("value is not a valid email address")
+    return value
+
+
+# Emails read back from the database were already validated by EmailStr on the
+# way in, so responses only re-check their shape instead of running
+# email-validator for every serialized user.
+StoredEmail = Annotated[
+    str,
+    AfterValidator(_check_email_shape),
+    Field(json_schema_extra={"format": "email"}),
+]
 
 
 class PostBase(BaseModel):
@@ -16,7 +42,7 @@ class PostCreate(PostBase):
 
 class UserOut(BaseModel):
     id: int
-    email: EmailStr
+    email: StoredEmail
     created_at: datetime
 
     model_config = ConfigDict(from_attributes=True)
@@ -61,6 +87,8 @@ class Token(BaseModel):
 
 class TokenData(BaseModel):
     id: Optional[int] = None
+    jti: Optional[str] = None
+    exp: Optional[int] = None
 
 
 class RefreshTokenRequest(BaseModel):
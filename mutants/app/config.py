@@ -1,27 +0,0 @@
-from pydantic_settings import BaseSettings, SettingsConfigDict
-
-
-class Settings(BaseSettings):
-    database_hostname: str = "localhost"
-    database_port: int = 5432
-    database_password: str = "password123"
-    database_name: str = "fastapi"
-    database_username: str = "postgres"
-    secret_key: str = "replace-this-in-production"
-    algorithm: str = "HS256"
-    access_token_expire_minutes: int = 60
-    cors_origins: list[str] = [
-        "http://localhost:3000",
-        "http://127.0.0.1:3000",
-        "http://localhost:8000",
-        "http://127.0.0.1:8000",
-    ]
-
-    model_config = SettingsConfigDict(
-        env_file=".env",
-        case_sensitive=False,
-        extra="ignore",
-    )
-
-
-settings = Settings()
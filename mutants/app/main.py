@@ -1,43 +0,0 @@
-from pathlib import Path
-
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import FileResponse
-from fastapi.staticfiles import StaticFiles
-
-from .config import settings
-from .routers import auth, post, user, vote
-
-app = FastAPI()
-
-frontend_dir = Path(__file__).resolve().parent / "frontend"
-static_dir = frontend_dir / "static"
-
-if static_dir.exists():
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.cors_origins,
-    allow_credentials=False,
-    allow_methods=["*"],
-    allow_headers=["*"],
-)
-
-app.include_router(post.router)
-app.include_router(user.router)
-app.include_router(auth.router)
-app.include_router(vote.router)
-
-
-@app.get("/", include_in_schema=False)
-def root():
-    index_file = frontend_dir / "index.html"
-    if index_file.exists():
-        return FileResponse(index_file)
-    return {"message": "FastAPI template API is running"}
-
-
-@app.get("/health")
-def health():
-    return {"status": "ok"}
@@ -1,13 +1,22 @@
+import os
+
 import pytest
-from app import models
+from app import models, oauth_external, rate_limit
 from app.config import settings
 from app.database import Base, get_db
 from app.main import app
 from app.oauth2 import create_access_token
 from fastapi.testclient import TestClient
+from hypothesis import settings as hypothesis_settings
 from sqlalchemy import create_engine
 from sqlalchemy.orm import sessionmaker
 
+# Property tests run 25 examples by default; HYPOTHESIS_PROFILE=dev (or
+# --hypothesis-profile=dev) explores more locally.
+hypothesis_settings.register_profile("ci", max_examples=25, deadline=None)
+hypothesis_settings.register_profile("dev", max_examples=200)
+hypothesis_settings.load_profile(os.getenv("HYPOTHESIS_PROFILE", "ci"))
+
 SQLALCHEMY_DATABASE_URL = (
     f"postgresql+psycopg://{settings.database_username}:{settings.database_password}"
     f"@{settings.database_hostname}:{settings.database_port}/{settings.database_name}_test"
@@ -32,6 +41,14 @@ def session():
 @pytest.fixture(autouse=True)
 def disable_rate_limiting_for_tests(monkeypatch):
     monkeypatch.setattr(settings, "rate_limit_enabled", False)
+    rate_limit.refresh_rate_limit_flag()
+
+
+@pytest.fixture(autouse=True)
+def refresh_oauth_provider_credentials():
+    oauth_external.refresh_provider_credentials()
+    yield
+    oauth_external.refresh_provider_credentials()
 
 
 @pytest.fixture()
@@ -46,6 +63,13 @@ def client(session):
     yield TestClient(app)
 
 
+@pytest.fixture(scope="session")
+def openapi_schema():
+    # The app builds its OpenAPI document at import, so this is the same dict
+    # /openapi.json serves; contract tests share it instead of re-fetching.
+    return app.openapi()
+
+
 @pytest.fixture
 def test_user2(client):
     user_data = {"email": "sanjeev123@gmail.com", "password": "password123"}
@@ -1,3 +1,4 @@
+import itertools
 import os
 import socket
 import subprocess
@@ -7,12 +8,9 @@ import uuid
 from pathlib import Path
 
 import httpx
-import psycopg2
+import psycopg
 import pytest
-from psycopg2 import sql
-
-pytestmark = pytest.mark.e2e
-
+from psycopg import sql
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
@@ -36,16 +34,21 @@ def _runtime_env(database_name):
     return env
 
 
-def _connect_admin(env):
-    return psycopg2.connect(
+def _connect(env, database_name, **kwargs):
+    return psycopg.connect(
         host=env["DATABASE_HOSTNAME"],
         port=int(env["DATABASE_PORT"]),
-        dbname="postgres",
+        dbname=database_name,
         user=env["DATABASE_USERNAME"],
         password=env["DATABASE_PASSWORD"],
+        **kwargs,
     )
 
 
+def _connect_admin(env):
+    return _connect(env, "postgres")
+
+
 def _drop_database(conn, database_name):
     with conn.cursor() as cursor:
         cursor.execute(
@@ -61,8 +64,18 @@ def _drop_database(conn, database_name):
         )
 
 
-@pytest.fixture(scope="module")
-def e2e_server():
+def _reset_tables(env):
+    with _connect(env, env["DATABASE_NAME"], autocommit=True) as conn:
+        conn.execute(
+            "TRUNCATE users, posts, votes, refresh_tokens, oauth_accounts, "
+            "outbox_events RESTART IDENTITY CASCADE"
+        )
+
+
+@pytest.fixture(scope="session")
+def e2e_env():
+    # One database and one migration run for the whole session; tests get a
+    # clean slate from e2e_clean_tables instead of a fresh database.
     database_name = f"fastapi_e2e_{uuid.uuid4().hex[:8]}"
     env = _runtime_env(database_name)
 
@@ -84,6 +97,19 @@ def e2e_server():
         check=True,
     )
 
+    try:
+        yield env
+    finally:
+        admin_connection = _connect_admin(env)
+        admin_connection.autocommit = True
+        try:
+            _drop_database(admin_connection, database_name)
+        finally:
+            admin_connection.close()
+
+
+@pytest.fixture(scope="session")
+def e2e_server(e2e_env):
     port = _find_free_port()
     process = subprocess.Popen(
         [
@@ -97,7 +123,7 @@ def e2e_server():
             str(port),
         ],
         cwd=PROJECT_ROOT,
-        env=env,
+        env=e2e_env,
         stdout=subprocess.PIPE,
         stderr=subprocess.STDOUT,
         text=True,
@@ -105,18 +131,19 @@ def e2e_server():
     base_url = f"http://127.0.0.1:{port}"
 
     started = False
-    deadline = time.time() + 25
-    while time.time() < deadline:
-        if process.poll() is not None:
-            break
-        try:
-            response = httpx.get(f"{base_url}/health", timeout=1)
-            if response.status_code == 200:
-                started = True
+    deadline = time.monotonic() + 25
+    with httpx.Client(base_url=base_url, timeout=1) as probe:
+        for attempt in itertools.count():
+            if process.poll() is not None or time.monotonic() >= deadline:
                 break
-        except httpx.HTTPError:
-            pass
-        time.sleep(0.2)
+            try:
+                if probe.get("/health").status_code == 200:
+                    started = True
+                    break
+            except httpx.HTTPError:
+                pass
+            # Poll every 20ms while uvicorn boots, backing off to 200ms.
+            time.sleep(min(0.2, 0.02 * (1 + attempt // 5)))
 
     if not started:
         output = ""
@@ -136,44 +163,18 @@ def e2e_server():
         except subprocess.TimeoutExpired:
             process.kill()
 
-        admin_connection = _connect_admin(env)
-        admin_connection.autocommit = True
-        try:
-            _drop_database(admin_connection, database_name)
-        finally:
-            admin_connection.close()
-
-
-def test_e2e_user_auth_post_vote_flow(e2e_server):
-    email = f"e2e_{uuid.uuid4().hex[:8]}@example.com"
-    password = "password123"
 
-    with httpx.Client(base_url=e2e_server, timeout=10) as client:
-        register = client.post("/users/", json={"email": email, "password": password})
-        assert register.status_code == 201
+@pytest.fixture(scope="session")
+def e2e_client(e2e_server):
+    # Shared pooled client so e2e tests reuse keep-alive connections.
+    with httpx.Client(
+        base_url=e2e_server,
+        timeout=10,
+        limits=httpx.Limits(max_keepalive_connections=8, max_connections=16),
+    ) as client:
+        yield client
 
-        login = client.post("/login", data={"username": email, "password": password})
-        assert login.status_code == 200
-        token = login.json()["access_token"]
-
-        auth_headers = {"Authorization": f"Bearer {token}"}
-        created_post = client.post(
-            "/posts/",
-            json={"title": "e2e post", "content": "full stack verification"},
-            headers=auth_headers,
-        )
-        assert created_post.status_code == 201
-        post_id = created_post.json()["id"]
-
-        vote = client.post(
-            "/vote/",
-            json={"post_id": post_id, "dir": 1},
-            headers=auth_headers,
-        )
-        assert vote.status_code == 201
 
-        single_post = client.get(f"/posts/{post_id}", headers=auth_headers)
-        assert single_post.status_code == 200
-        payload = single_post.json()
-        assert payload["Post"]["id"] == post_id
-        assert payload["votes"] == 1
+@pytest.fixture(autouse=True)
+def e2e_clean_tables(e2e_env):
+    _reset_tables(e2e_env)
@@ -6,24 +6,27 @@ from hypothesis import strategies as st
 
 pytestmark = [pytest.mark.unit, pytest.mark.property]
 
+_USER_IDS = st.integers(min_value=1, max_value=10_000_000)
+_TOKEN_TEXT = st.text(min_size=1, max_size=60)
 
-def _credentials_exception():
-    return HTTPException(
-        status_code=status.HTTP_401_UNAUTHORIZED,
-        detail="Could not validate credentials",
-        headers={"WWW-Authenticate": "Bearer"},
-    )
 
+# Shared across examples: verify_access_token only raises it, never mutates it.
+_CREDENTIALS_EXCEPTION = HTTPException(
+    status_code=status.HTTP_401_UNAUTHORIZED,
+    detail="Could not validate credentials",
+    headers={"WWW-Authenticate": "Bearer"},
+)
 
-@given(st.integers(min_value=1, max_value=10_000_000))
+
+@given(_USER_IDS)
 def test_access_token_roundtrip_preserves_user_id(user_id: int):
     token = oauth2.create_access_token({"user_id": user_id})
-    token_data = oauth2.verify_access_token(token, _credentials_exception())
+    token_data = oauth2.verify_access_token(token, _CREDENTIALS_EXCEPTION)
 
     assert token_data.id == user_id
 
 
-@given(st.text(min_size=1, max_size=60))
+@given(_TOKEN_TEXT)
 def test_random_non_jwt_tokens_are_rejected(random_text: str):
     # Ensure we only test truly malformed values, not accidental JWTs.
     assume_jwt_like = random_text.count(".") >= 2
@@ -31,6 +34,6 @@ def test_random_non_jwt_tokens_are_rejected(random_text: str):
         random_text = f"{random_text}-not-a-jwt"
 
     with pytest.raises(HTTPException) as exc_info:
-        oauth2.verify_access_token(random_text, _credentials_exception())
+        oauth2.verify_access_token(random_text, _CREDENTIALS_EXCEPTION)
 
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
@@ -8,31 +8,35 @@ from app.config import settings
 pytestmark = [pytest.mark.integration, pytest.mark.security]
 
 
-def _expired_token(user_id: int) -> str:
+@pytest.fixture
+def expired_token(test_user):
     payload = {
-        "user_id": user_id,
+        "user_id": test_user["id"],
         "exp": datetime.now(timezone.utc) - timedelta(minutes=1),
     }
     return jwt.encode(payload, settings.secret_key, algorithm=settings.algorithm)
 
 
-def _forged_token(user_id: int) -> str:
+@pytest.fixture
+def forged_token(test_user):
     payload = {
-        "user_id": user_id,
+        "user_id": test_user["id"],
         "exp": datetime.now(timezone.utc) + timedelta(minutes=30),
     }
     return jwt.encode(payload, "wrong-secret", algorithm=settings.algorithm)
 
 
-def test_expired_token_is_rejected(client, test_user):
-    token = _expired_token(test_user["id"])
-    response = client.get("/api/v1/posts/", headers={"Authorization": f"Bearer {token}"})
+def test_expired_token_is_rejected(client, expired_token):
+    response = client.get(
+        "/api/v1/posts/", headers={"Authorization": f"Bearer {expired_token}"}
+    )
     assert response.status_code == 401
 
 
-def test_forged_token_is_rejected(client, test_user):
-    token = _forged_token(test_user["id"])
-    response = client.get("/api/v1/posts/", headers={"Authorization": f"Bearer {token}"})
+def test_forged_token_is_rejected(client, forged_token):
+    response = client.get(
+        "/api/v1/posts/", headers={"Authorization": f"Bearer {forged_token}"}
+    )
     assert response.status_code == 401
 
 
@@ -98,7 +102,7 @@ def test_disallowed_cors_origin_is_not_allowed(client):
 
 
 def test_security_headers_are_applied(client):
-    response = client.get("/health")
+    response = client.get("/")
     assert response.status_code == 200
     assert response.headers["x-content-type-options"] == "nosniff"
     assert response.headers["x-frame-options"] == "DENY"
@@ -114,3 +118,13 @@ def test_auth_responses_are_no_store(client, test_user):
     assert response.status_code == 200
     assert response.headers["cache-control"] == "no-store"
     assert response.headers["pragma"] == "no-cache"
+
+
+def test_percent_encoded_auth_path_is_still_no_store(client, test_user):
+    # Routing matches the decoded scope["path"]; policy must key off the same value.
+    response = client.post(
+        "/api/v1/logi%6e",
+        data={"username": test_user["email"], "password": test_user["password"]},
+    )
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == "no-store"
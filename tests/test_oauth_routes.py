@@ -5,10 +5,40 @@ from app.config import settings
 pytestmark = pytest.mark.integration
 
 
+def _returning(value):
+    async def _fake(*_args, **_kwargs):
+        return value
+
+    return _fake
+
+
+@pytest.fixture
+def stub_oauth_callback(monkeypatch):
+    """Stub state parsing (and optionally the provider exchange) for callbacks."""
+
+    def _apply(*, redirect_to_frontend, link_user_id=None, result=None):
+        state = oauth_external.OAuthState(
+            provider="github",
+            code_verifier="verifier",
+            redirect_to_frontend=redirect_to_frontend,
+            link_user_id=link_user_id,
+        )
+        monkeypatch.setattr(
+            oauth_external, "parse_oauth_state", lambda *_args, **_kwargs: state
+        )
+        if result is not None:
+            monkeypatch.setattr(
+                oauth_external, "complete_oauth_callback", _returning(result)
+            )
+
+    return _apply
+
+
 def test_oauth_providers_empty_when_unconfigured(client, monkeypatch):
     for provider in ["google", "microsoft", "apple", "facebook", "github"]:
         monkeypatch.setattr(settings, f"oauth_{provider}_client_id", None)
         monkeypatch.setattr(settings, f"oauth_{provider}_client_secret", None)
+    oauth_external.refresh_provider_credentials()
 
     response = client.get("/api/v1/auth/oauth/providers")
     assert response.status_code == 200
@@ -22,6 +52,7 @@ def test_oauth_providers_lists_configured_provider(client, monkeypatch):
 
     monkeypatch.setattr(settings, "oauth_github_client_id", "github-id")
     monkeypatch.setattr(settings, "oauth_github_client_secret", "github-secret")
+    oauth_external.refresh_provider_credentials()
 
     response = client.get("/api/v1/auth/oauth/providers")
     assert response.status_code == 200
@@ -34,6 +65,9 @@ def test_oauth_providers_lists_configured_provider(client, monkeypatch):
             "link_start_url": "/api/v1/auth/oauth/github/link/start",
         }
     ]
+    again = client.get("/api/v1/auth/oauth/providers")
+    assert again.content == response.content
+    assert again.headers["content-type"] == "application/json"
 
 
 def test_oauth_start_redirects_to_provider(client, monkeypatch):
@@ -83,16 +117,10 @@ def test_oauth_callback_requires_state(client):
     assert response.json()["error_code"] == "invalid_oauth_state"
 
 
-def test_oauth_callback_provider_error_redirects_when_frontend_mode(client, monkeypatch):
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=True,
-        ),
-    )
+def test_oauth_callback_provider_error_redirects_when_frontend_mode(
+    client, stub_oauth_callback
+):
+    stub_oauth_callback(redirect_to_frontend=True)
 
     response = client.get(
         "/api/v1/auth/oauth/github/callback",
@@ -108,16 +136,8 @@ def test_oauth_callback_provider_error_redirects_when_frontend_mode(client, monk
     assert response.headers["location"] == "/#provider=github&error=Denied"
 
 
-def test_oauth_callback_provider_error_json_mode(client, monkeypatch):
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=False,
-        ),
-    )
+def test_oauth_callback_provider_error_json_mode(client, stub_oauth_callback):
+    stub_oauth_callback(redirect_to_frontend=False)
 
     response = client.get(
         "/api/v1/auth/oauth/github/callback",
@@ -128,16 +148,26 @@ def test_oauth_callback_provider_error_json_mode(client, monkeypatch):
     assert response.json()["error_code"] == "oauth_provider_error"
 
 
-def test_oauth_callback_requires_code_when_no_error(client, monkeypatch):
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=False,
-        ),
+def test_oauth_callback_rejects_replayed_state(client):
+    state = oauth_external.build_oauth_state(
+        provider="github",
+        code_verifier="verifier",
+        redirect_to_frontend=False,
     )
+    params = {"state": state, "error": "access_denied"}
+
+    first = client.get("/api/v1/auth/oauth/github/callback", params=params)
+    replay = client.get("/api/v1/auth/oauth/github/callback", params=params)
+
+    assert first.status_code == 400
+    assert first.json()["error_code"] == "oauth_provider_error"
+    assert replay.status_code == 400
+    assert replay.json()["error_code"] == "invalid_oauth_state"
+    assert replay.json()["detail"] == "OAuth state was already used"
+
+
+def test_oauth_callback_requires_code_when_no_error(client, stub_oauth_callback):
+    stub_oauth_callback(redirect_to_frontend=False)
 
     response = client.get(
         "/api/v1/auth/oauth/github/callback",
@@ -148,25 +178,15 @@ def test_oauth_callback_requires_code_when_no_error(client, monkeypatch):
     assert response.json()["error_code"] == "oauth_code_missing"
 
 
-def test_oauth_callback_success_redirect_mode(client, monkeypatch):
+def test_oauth_callback_success_redirect_mode(client, monkeypatch, stub_oauth_callback):
     token = oauth_external.schemas.Token(
         access_token="access",
         token_type="bearer",
         refresh_token="refresh",
     )
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=True,
-        ),
-    )
-    monkeypatch.setattr(
-        oauth_external,
-        "complete_oauth_callback",
-        lambda *_args, **_kwargs: oauth_external.OAuthCallbackResult(
+    stub_oauth_callback(
+        redirect_to_frontend=True,
+        result=oauth_external.OAuthCallbackResult(
             provider="github",
             redirect_to_frontend=True,
             token=token,
@@ -188,25 +208,15 @@ def test_oauth_callback_success_redirect_mode(client, monkeypatch):
     assert response.headers["location"] == "/#provider=github&access_token=access"
 
 
-def test_oauth_callback_success_json_mode(client, monkeypatch):
+def test_oauth_callback_success_json_mode(client, stub_oauth_callback):
     token = oauth_external.schemas.Token(
         access_token="access",
         token_type="bearer",
         refresh_token="refresh",
     )
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=False,
-        ),
-    )
-    monkeypatch.setattr(
-        oauth_external,
-        "complete_oauth_callback",
-        lambda *_args, **_kwargs: oauth_external.OAuthCallbackResult(
+    stub_oauth_callback(
+        redirect_to_frontend=False,
+        result=oauth_external.OAuthCallbackResult(
             provider="github",
             redirect_to_frontend=False,
             token=token,
@@ -222,21 +232,11 @@ def test_oauth_callback_success_json_mode(client, monkeypatch):
     assert response.json()["access_token"] == "access"
 
 
-def test_oauth_callback_link_redirect_mode(client, monkeypatch):
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=True,
-            link_user_id=1,
-        ),
-    )
-    monkeypatch.setattr(
-        oauth_external,
-        "complete_oauth_callback",
-        lambda *_args, **_kwargs: oauth_external.OAuthCallbackResult(
+def test_oauth_callback_link_redirect_mode(client, stub_oauth_callback):
+    stub_oauth_callback(
+        redirect_to_frontend=True,
+        link_user_id=1,
+        result=oauth_external.OAuthCallbackResult(
             provider="github",
             redirect_to_frontend=True,
             linked=True,
@@ -253,21 +253,11 @@ def test_oauth_callback_link_redirect_mode(client, monkeypatch):
     assert response.headers["location"] == "/#provider=github&linked=true"
 
 
-def test_oauth_callback_link_json_mode(client, monkeypatch):
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=False,
-            link_user_id=1,
-        ),
-    )
-    monkeypatch.setattr(
-        oauth_external,
-        "complete_oauth_callback",
-        lambda *_args, **_kwargs: oauth_external.OAuthCallbackResult(
+def test_oauth_callback_link_json_mode(client, stub_oauth_callback):
+    stub_oauth_callback(
+        redirect_to_frontend=False,
+        link_user_id=1,
+        result=oauth_external.OAuthCallbackResult(
             provider="github",
             redirect_to_frontend=False,
             linked=True,
@@ -283,20 +273,12 @@ def test_oauth_callback_link_json_mode(client, monkeypatch):
     assert response.json() == {"provider": "github", "linked": True}
 
 
-def test_oauth_callback_redirect_mode_missing_token_returns_500(client, monkeypatch):
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=True,
-        ),
-    )
-    monkeypatch.setattr(
-        oauth_external,
-        "complete_oauth_callback",
-        lambda *_args, **_kwargs: oauth_external.OAuthCallbackResult(
+def test_oauth_callback_redirect_mode_missing_token_returns_500(
+    client, stub_oauth_callback
+):
+    stub_oauth_callback(
+        redirect_to_frontend=True,
+        result=oauth_external.OAuthCallbackResult(
             provider="github",
             redirect_to_frontend=True,
             token=None,
@@ -312,20 +294,12 @@ def test_oauth_callback_redirect_mode_missing_token_returns_500(client, monkeypa
     assert response.json()["error_code"] == "oauth_callback_invalid_response"
 
 
-def test_oauth_callback_json_mode_missing_token_returns_500(client, monkeypatch):
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=False,
-        ),
-    )
-    monkeypatch.setattr(
-        oauth_external,
-        "complete_oauth_callback",
-        lambda *_args, **_kwargs: oauth_external.OAuthCallbackResult(
+def test_oauth_callback_json_mode_missing_token_returns_500(
+    client, stub_oauth_callback
+):
+    stub_oauth_callback(
+        redirect_to_frontend=False,
+        result=oauth_external.OAuthCallbackResult(
             provider="github",
             redirect_to_frontend=False,
             token=None,
@@ -341,25 +315,15 @@ def test_oauth_callback_json_mode_missing_token_returns_500(client, monkeypatch)
     assert response.json()["error_code"] == "oauth_callback_invalid_response"
 
 
-def test_oauth_callback_post_path(client, monkeypatch):
+def test_oauth_callback_post_path(client, stub_oauth_callback):
     token = oauth_external.schemas.Token(
         access_token="access",
         token_type="bearer",
         refresh_token="refresh",
     )
-    monkeypatch.setattr(
-        oauth_external,
-        "parse_oauth_state",
-        lambda *_args, **_kwargs: oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=False,
-        ),
-    )
-    monkeypatch.setattr(
-        oauth_external,
-        "complete_oauth_callback",
-        lambda *_args, **_kwargs: oauth_external.OAuthCallbackResult(
+    stub_oauth_callback(
+        redirect_to_frontend=False,
+        result=oauth_external.OAuthCallbackResult(
             provider="github",
             redirect_to_frontend=False,
             token=token,
@@ -1,4 +1,5 @@
 import pytest
+from app.routers import auth
 
 pytestmark = pytest.mark.integration
 
@@ -11,3 +12,38 @@ def test_login_existing_user_with_wrong_password_returns_403(client, test_user):
 
     assert response.status_code == 403
     assert response.json()["detail"] == "Invalid Credentials"
+
+
+def test_login_normalizes_username_before_lookup(client, test_user):
+    response = client.post(
+        "/api/v1/login",
+        data={
+            "username": f"  {test_user['email'].upper()} ",
+            "password": test_user["password"],
+        },
+    )
+
+    assert response.status_code == 200
+    assert response.json()["token_type"] == "bearer"
+
+
+@pytest.mark.parametrize("known_user", [True, False])
+def test_failed_login_runs_a_single_password_verify(
+    client, test_user, monkeypatch, known_user
+):
+    real_verify = auth.utils.verify
+    calls: list[str] = []
+
+    def counting_verify(plain, hashed):
+        calls.append(hashed)
+        return real_verify(plain, hashed)
+
+    monkeypatch.setattr(auth.utils, "verify", counting_verify)
+    username = test_user["email"] if known_user else "nobody@example.com"
+    response = client.post(
+        "/api/v1/login", data={"username": username, "password": "wrong-password"}
+    )
+
+    assert response.status_code == 403
+    assert len(calls) == 1
+    assert (calls[0] == auth._DUMMY_PASSWORD_HASH) is not known_user
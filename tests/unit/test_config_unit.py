@@ -1,4 +1,5 @@
 import pytest
+from app import config
 from app.config import Settings
 
 pytestmark = pytest.mark.unit
@@ -47,3 +48,8 @@ def test_settings_rejects_weak_secret_in_production():
 def test_settings_accepts_strong_secret_in_production():
     cfg = Settings(environment="production", secret_key="a" * 32)
     assert cfg.secret_key == "a" * 32
+
+
+def test_get_settings_returns_module_singleton():
+    assert config.get_settings() is config.get_settings()
+    assert config.get_settings() is config.settings
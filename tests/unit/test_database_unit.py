@@ -23,3 +23,11 @@ def test_get_db_yields_session_and_closes(monkeypatch):
         next(session_generator)
 
     assert dummy_session.closed is True
+
+
+def test_engine_pool_uses_configured_sizes():
+    assert database.engine.pool.size() == database.settings.database_pool_size
+    assert database.engine.pool._max_overflow == database.settings.database_max_overflow
+    assert (
+        database.engine.pool._recycle == database.settings.database_pool_recycle_seconds
+    )
@@ -28,12 +28,14 @@ def test_status_helpers_and_normalize_detail():
     assert errors._status_title(200) == "OK"
     assert errors._status_title(999) == "Error"
     assert errors._status_error_code(503) == "http_503"
+    assert errors._status_error_code(599) == "http_599"
     assert errors._normalize_detail({"detail": "x", "error_code": "custom"}) == (
         "x",
         "custom",
     )
     assert errors._normalize_detail(None) == ("Request failed", "request_failed")
     assert errors._normalize_detail("plain") == ("plain", "request_failed")
+    assert errors._normalize_detail(["a"]) == ("['a']", "request_failed")
 
 
 def test_problem_document_and_response_include_expected_fields():
@@ -96,3 +98,10 @@ def test_registered_handlers_return_problem_details():
     boom_response = client.get("/boom")
     assert boom_response.status_code == 500
     assert boom_response.json()["error_code"] == "http_500"
+
+
+def test_problem_json_response_falls_back_for_values_orjson_rejects():
+    response = errors.ProblemJSONResponse({"input": 2**70})
+
+    assert response.body == b'{"input":1180591620717411303424}'
+    assert response.media_type == "application/problem+json"
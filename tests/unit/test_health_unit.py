@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 from app import health
 from sqlalchemy.exc import SQLAlchemyError
@@ -5,6 +7,13 @@ from sqlalchemy.exc import SQLAlchemyError
 pytestmark = pytest.mark.unit
 
 
+@pytest.fixture(autouse=True)
+def _reset_readiness_cache():
+    health.reset_readiness_cache()
+    yield
+    health.reset_readiness_cache()
+
+
 class _DummyConnection:
     def __enter__(self):
         return self
@@ -45,6 +54,45 @@ def test_redis_ready_behaviour(monkeypatch):
 def test_readiness_state_reports_combined_checks(monkeypatch):
     monkeypatch.setattr(health, "database_ready", lambda: True)
     monkeypatch.setattr(health, "redis_ready", lambda: False)
-    ready, checks = health.readiness_state()
+    ready, checks = asyncio.run(health.readiness_state())
     assert ready is False
     assert checks == {"database": True, "redis": False}
+
+
+def test_readiness_state_caches_success_within_ttl(monkeypatch):
+    calls = []
+    monkeypatch.setattr(health.settings, "readiness_cache_ttl_seconds", 60.0)
+    monkeypatch.setattr(health, "database_ready", lambda: calls.append("db") or True)
+    monkeypatch.setattr(health, "redis_ready", lambda: True)
+
+    assert asyncio.run(health.readiness_state()) == (
+        True,
+        {"database": True, "redis": True},
+    )
+    assert asyncio.run(health.readiness_state()) == (
+        True,
+        {"database": True, "redis": True},
+    )
+    assert calls == ["db"]
+
+
+def test_readiness_state_does_not_cache_failures(monkeypatch):
+    calls = []
+    monkeypatch.setattr(health.settings, "readiness_cache_ttl_seconds", 60.0)
+    monkeypatch.setattr(health, "database_ready", lambda: calls.append("db") or False)
+    monkeypatch.setattr(health, "redis_ready", lambda: True)
+
+    assert asyncio.run(health.readiness_state())[0] is False
+    assert asyncio.run(health.readiness_state())[0] is False
+    assert calls == ["db", "db"]
+
+
+def test_readiness_state_rechecks_after_ttl(monkeypatch):
+    calls = []
+    monkeypatch.setattr(health.settings, "readiness_cache_ttl_seconds", 0.0)
+    monkeypatch.setattr(health, "database_ready", lambda: calls.append("db") or True)
+    monkeypatch.setattr(health, "redis_ready", lambda: True)
+
+    asyncio.run(health.readiness_state())
+    asyncio.run(health.readiness_state())
+    assert calls == ["db", "db"]
@@ -1,3 +1,4 @@
+import asyncio
 import runpy
 import warnings
 from pathlib import Path
@@ -6,12 +7,21 @@ from types import SimpleNamespace
 import pytest
 from app import main
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse, ORJSONResponse
 from fastapi.testclient import TestClient
+from starlette.middleware.cors import CORSMiddleware
 from starlette.middleware.httpsredirect import HTTPSRedirectMiddleware
 
 pytestmark = pytest.mark.unit
 
 
+@pytest.fixture(autouse=True)
+def _clear_domain_router_cache():
+    main._discover_domain_routers.cache_clear()
+    yield
+    main._discover_domain_routers.cache_clear()
+
+
 def test_root_serves_frontend_html():
     client = TestClient(main.app)
     response = client.get("/")
@@ -21,8 +31,8 @@ def test_root_serves_frontend_html():
     assert "Template Control Panel" in response.text
 
 
-def test_root_returns_fallback_when_index_missing(monkeypatch, tmp_path):
-    monkeypatch.setattr(main, "frontend_dir", tmp_path)
+def test_root_returns_fallback_when_index_missing(monkeypatch):
+    monkeypatch.setattr(main, "_INDEX_FILE", None)
 
     response = main.root()
 
@@ -31,8 +41,30 @@ def test_root_returns_fallback_when_index_missing(monkeypatch, tmp_path):
 
 def test_root_returns_fallback_when_frontend_is_disabled(monkeypatch):
     monkeypatch.setattr(main.settings, "enable_optional_frontend", False)
-    assert main.root() == {"message": "FastAPI template API is running"}
-    monkeypatch.setattr(main.settings, "enable_optional_frontend", True)
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore",
+            category=RuntimeWarning,
+            message=".*app.main.*found in sys.modules.*",
+        )
+        module_vars = runpy.run_module(
+            "app.main", run_name="__coverage_main_no_frontend"
+        )
+
+    assert module_vars["_INDEX_FILE"] is None
+    assert module_vars["root"]() == {"message": "FastAPI template API is running"}
+
+
+def test_static_assets_are_served_with_cache_policy():
+    client = TestClient(main.app)
+    response = client.get("/static/app.js")
+
+    assert response.status_code == 200
+    assert response.headers["cache-control"] == (
+        f"public, max-age={main.settings.static_cache_max_age_seconds}"
+    )
+    assert response.headers["x-content-type-options"] == "nosniff"
 
 
 def test_health_endpoint_returns_ok():
@@ -41,53 +73,144 @@ def test_health_endpoint_returns_ok():
 
     assert response.status_code == 200
     assert response.json() == {"status": "ok"}
+    assert response.headers["content-type"] == "application/json"
+
+
+def test_health_short_circuit_matches_route_response():
+    assert JSONResponse(main.health()).body == main._HEALTH_BODY
+
+    client = TestClient(main.app)
+    assert client.post("/health").status_code == 405
 
 
 def test_ready_endpoint_success_and_failure(monkeypatch):
     client = TestClient(main.app, raise_server_exceptions=False)
 
-    monkeypatch.setattr(main, "readiness_state", lambda: (True, {"database": True, "redis": True}))
+    async def _ready():
+        return True, {"database": True, "redis": True}
+
+    async def _not_ready():
+        return False, {"database": False, "redis": True}
+
+    monkeypatch.setattr(main, "readiness_state", _ready)
     success = client.get("/ready")
     assert success.status_code == 200
     assert success.json()["checks"]["database"] is True
 
-    monkeypatch.setattr(main, "readiness_state", lambda: (False, {"database": False, "redis": True}))
+    monkeypatch.setattr(main, "readiness_state", _not_ready)
     failed = client.get("/ready")
     assert failed.status_code == 503
     assert failed.json()["error_code"] == "service_not_ready"
 
 
+def test_is_auth_path_matches_any_versioned_auth_route():
+    assert main._is_auth_path("/api/v1/login") is True
+    assert main._is_auth_path("/api/v1/auth/oauth/github/start") is True
+    assert main._is_auth_path("/api/v2/auth/refresh") is True
+    assert main._is_auth_path("/api/v1/posts/login") is False
+    assert main._is_auth_path("/api/v1/auth/oauth") is False
+    assert main._is_auth_path("/health") is False
+
+
 def test_api_version_resolution_and_headers():
     assert main._resolve_api_version("/api/v1/posts", None) == ("v1", False)
+    assert main._resolve_api_version("/api/v1", None) == ("v1", False)
+    assert main._resolve_api_version("/api/v10/posts", None) == ("v1", True)
     assert main._resolve_api_version("/health", "v1") == ("v1", False)
     assert main._resolve_api_version("/health", "v999") == ("v1", True)
 
     client = TestClient(main.app)
-    defaulted = client.get("/health")
+    defaulted = client.get("/")
     assert defaulted.headers["X-API-Version"] == "v1"
     assert defaulted.headers["X-API-Version-Defaulted"] == "true"
 
-    explicit = client.get("/health", headers={"x-api-version": "v1"})
+    explicit = client.get("/", headers={"x-api-version": "v1"})
     assert explicit.headers["X-API-Version"] == "v1"
     assert "X-API-Version-Defaulted" not in explicit.headers
 
 
 def test_security_headers_can_be_disabled(monkeypatch):
-    monkeypatch.setattr(main.settings, "security_headers_enabled", False)
+    monkeypatch.setattr(main, "_SECURITY_HEADERS_ENABLED", False)
     client = TestClient(main.app)
-    response = client.get("/health")
+    response = client.get("/")
     assert response.status_code == 200
     assert "x-content-type-options" not in response.headers
-    monkeypatch.setattr(main.settings, "security_headers_enabled", True)
 
 
 def test_security_headers_include_hsts_for_https(monkeypatch):
-    monkeypatch.setattr(main.settings, "security_hsts_enabled", True)
+    monkeypatch.setattr(main, "_HSTS_ENABLED", True)
+    monkeypatch.setattr(
+        main, "_SECURITY_HEADER_SETS", main._build_security_header_sets()
+    )
     client = TestClient(main.app, base_url="https://testserver")
+    response = client.get("/")
+    assert response.status_code == 200
+    assert (
+        response.headers["strict-transport-security"] == main._HSTS_HEADER[1].decode()
+    )
+
+
+def test_csp_is_skipped_only_for_exact_docs_paths():
+    client = TestClient(main.app)
+    docs = client.get("/docs")
+    assert docs.status_code == 200
+    assert "content-security-policy" not in docs.headers
+    assert docs.headers["x-content-type-options"] == "nosniff"
+
+    lookalike = client.get("/docs-archive")
+    assert lookalike.headers["content-security-policy"] == main._CSP_POLICY
+
+
+def test_request_policy_middleware_skips_probe_endpoints():
+    client = TestClient(main.app)
     response = client.get("/health")
     assert response.status_code == 200
-    assert response.headers["strict-transport-security"].startswith("max-age=")
-    monkeypatch.setattr(main.settings, "security_hsts_enabled", False)
+    assert "x-api-version" not in response.headers
+    assert "content-security-policy" not in response.headers
+
+
+def test_request_policy_middleware_passes_through_non_http_scopes():
+    seen = []
+
+    async def inner(scope, receive, send):
+        seen.append(scope["type"])
+
+    middleware = main.RequestPolicyMiddleware(inner)
+    asyncio.run(middleware({"type": "lifespan"}, None, None))
+
+    assert seen == ["lifespan"]
+
+
+def test_request_policy_middleware_sets_state_and_tolerates_missing_headers():
+    sent = []
+    scope = {"type": "http", "path": "/api/v1/posts", "headers": []}
+
+    async def inner(scope, receive, send):
+        await send({"type": "http.response.start", "status": 204})
+        await send({"type": "http.response.body", "body": b""})
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(main.RequestPolicyMiddleware(inner)(scope, None, send))
+
+    assert scope["state"]["api_version"] == "v1"
+    assert (b"x-api-version", b"v1") in sent[0]["headers"]
+    assert sent[1] == {"type": "http.response.body", "body": b""}
+
+
+def test_merge_headers_keeps_app_values_for_defaults_and_replaces_overrides():
+    merged = main._merge_headers(
+        [(b"X-Frame-Options", b"SAMEORIGIN"), (b"cache-control", b"max-age=60")],
+        [(b"cache-control", b"no-store")],
+        [(b"x-frame-options", b"DENY"), (b"referrer-policy", b"no-referrer")],
+    )
+
+    assert merged == [
+        (b"X-Frame-Options", b"SAMEORIGIN"),
+        (b"cache-control", b"no-store"),
+        (b"referrer-policy", b"no-referrer"),
+    ]
 
 
 def test_include_api_routers_rejects_invalid_latest_version(monkeypatch):
@@ -99,6 +222,26 @@ def test_include_api_routers_rejects_invalid_latest_version(monkeypatch):
     monkeypatch.setattr(main.settings, "api_supported_versions", ["v1"])
 
 
+def test_main_module_mounts_supported_versions_and_documents_latest(monkeypatch):
+    monkeypatch.setattr(main.settings, "api_supported_versions", ["v0", "v1"])
+
+    with warnings.catch_warnings():
+        warnings.filterwarnings(
+            "ignore",
+            category=RuntimeWarning,
+            message=".*app.main.*found in sys.modules.*",
+        )
+        module_vars = runpy.run_module("app.main", run_name="__coverage_main_versions")
+
+    versioned_app = module_vars["app"]
+    route_paths = {getattr(route, "path", "") for route in versioned_app.routes}
+    assert {"/api/v0/posts/", "/api/v1/posts/"} <= route_paths
+    assert versioned_app.openapi_schema is not None
+    documented = versioned_app.openapi_schema["paths"]
+    assert "/api/v1/posts/" in documented
+    assert not any(path.startswith("/api/v0/") for path in documented)
+
+
 def test_discover_domain_routers_returns_empty_when_package_missing(monkeypatch):
     package_name = "app.missing_domains"
 
@@ -108,7 +251,7 @@ def test_discover_domain_routers_returns_empty_when_package_missing(monkeypatch)
         raise exc
 
     monkeypatch.setattr(main, "import_module", fake_import)
-    assert main._discover_domain_routers(package_name) == []
+    assert main._discover_domain_routers(package_name) == ()
 
 
 def test_discover_domain_routers_reraises_unrelated_import_error(monkeypatch):
@@ -126,7 +269,7 @@ def test_discover_domain_routers_reraises_unrelated_import_error(monkeypatch):
 
 def test_discover_domain_routers_returns_empty_for_non_package(monkeypatch):
     monkeypatch.setattr(main, "import_module", lambda _module_path: object())
-    assert main._discover_domain_routers("app.domains") == []
+    assert main._discover_domain_routers("app.domains") == ()
 
 
 def test_discover_domain_routers_collects_sorted_package_routers(monkeypatch):
@@ -153,7 +296,8 @@ def test_discover_domain_routers_collects_sorted_package_routers(monkeypatch):
         }.get(module_path),
     )
     routers = main._discover_domain_routers("app.domains")
-    assert routers == [expected_alpha, expected_zeta]
+    assert routers == (expected_alpha, expected_zeta)
+    assert main._discover_domain_routers("app.domains") is routers
 
 
 def test_discover_domain_routers_skips_packages_without_router(monkeypatch):
@@ -177,7 +321,7 @@ def test_discover_domain_routers_skips_packages_without_router(monkeypatch):
         else None,
     )
     routers = main._discover_domain_routers("app.domains")
-    assert routers == [expected_alpha]
+    assert routers == (expected_alpha,)
 
 
 def test_load_optional_domain_router_returns_none_when_router_module_missing(monkeypatch):
@@ -261,3 +405,45 @@ def test_main_module_handles_missing_static_dir(monkeypatch):
     ]
 
     assert mounted_static == []
+
+
+def test_cors_origins_are_checked_against_a_frozenset():
+    (cors,) = [m for m in main.app.user_middleware if m.cls is CORSMiddleware]
+    assert isinstance(cors.kwargs["allow_origins"], frozenset)
+
+    client = TestClient(main.app)
+    allowed = main.settings.cors_origins[0]
+    preflight = {"Access-Control-Request-Method": "GET"}
+    ok = client.options("/", headers={"Origin": allowed, **preflight})
+    denied = client.options(
+        "/", headers={"Origin": "https://evil.example", **preflight}
+    )
+
+    assert ok.headers["access-control-allow-origin"] == allowed
+    assert denied.status_code == 400
+
+
+def test_lifespan_checks_event_loop(monkeypatch):
+    calls = []
+    monkeypatch.setattr(main, "warn_if_default_event_loop", lambda: calls.append(1))
+
+    with TestClient(main.app):
+        pass
+
+    assert calls == [1]
+
+
+def test_routes_render_with_orjson_by_default():
+    assert main.app.router.default_response_class is ORJSONResponse
+
+    # The middleware short-circuit must stay byte-identical to the route.
+    assert ORJSONResponse(main.health()).body == main._HEALTH_BODY
+
+
+def test_routes_are_registered_once():
+    seen = set()
+    for route in main.app.routes:
+        for method in sorted(getattr(route, "methods", None) or {"*"}):
+            key = (route.path, method)
+            assert key not in seen, f"duplicate route {key}"
+            seen.add(key)
@@ -6,10 +6,16 @@ import pytest
 from app import models, oauth2
 from fastapi import HTTPException, status
 from jwt import InvalidTokenError
+from sqlalchemy import inspect as sa_inspect
+from starlette.requests import Request
 
 pytestmark = pytest.mark.unit
 
 
+def _request() -> Request:
+    return Request({"type": "http", "headers": []})
+
+
 def credentials_exception():
     return HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -38,17 +44,14 @@ def test_verify_access_token_rejects_invalid_token():
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
 
 
-class DummyQuery:
-    def filter(self, *args, **kwargs):
-        return self
-
+class DummyResult:
     def first(self):
         return None
 
 
 class DummySession:
-    def query(self, *args, **kwargs):
-        return DummyQuery()
+    def scalars(self, *args, **kwargs):
+        return DummyResult()
 
 
 def test_get_current_user_rejects_unknown_user():
@@ -56,15 +59,100 @@ def test_get_current_user_rejects_unknown_user():
     db = DummySession()
 
     with pytest.raises(HTTPException) as exc_info:
-        oauth2.get_current_user(token=token, db=db)
+        oauth2.get_current_user(_request(), token=token, db=db)
 
     assert exc_info.value.status_code == status.HTTP_401_UNAUTHORIZED
 
 
+class _UserSession:
+    def __init__(self, user):
+        self.user = user
+        self.queries = 0
+        self.merged = []
+
+    def scalars(self, *args, **kwargs):
+        self.queries += 1
+        session = self
+
+        class _Result:
+            def first(self):
+                return session.user
+
+        return _Result()
+
+    def merge(self, instance, load=True):
+        self.merged.append((instance, load))
+        return instance
+
+
+@pytest.fixture
+def user_cache(monkeypatch):
+    oauth2.clear_user_cache()
+    monkeypatch.setattr(oauth2.settings, "auth_user_cache_ttl_seconds", 60.0)
+    monkeypatch.setattr(oauth2.settings, "auth_user_cache_max_entries", 10)
+    yield
+    oauth2.clear_user_cache()
+
+
+def _user(user_id=5):
+    return models.User(
+        id=user_id,
+        email=f"user{user_id}@example.com",
+        password="hashed",
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def test_get_current_user_serves_repeat_tokens_from_cache(user_cache):
+    token = oauth2.create_access_token({"user_id": 5})
+    db = _UserSession(_user())
+
+    first = oauth2.get_current_user(_request(), token=token, db=db)
+    second = oauth2.get_current_user(_request(), token=token, db=db)
+
+    assert first.id == 5
+    assert second.email == "user5@example.com"
+    assert db.queries == 1
+    assert db.merged and db.merged[0][1] is False
+    assert second is not first
+
+
+def test_user_cache_expires_entries(user_cache, monkeypatch):
+    token = oauth2.create_access_token({"user_id": 5})
+    db = _UserSession(_user())
+    oauth2.get_current_user(_request(), token=token, db=db)
+
+    clock = oauth2.time.monotonic() + 120
+    monkeypatch.setattr(oauth2.time, "monotonic", lambda: clock)
+    oauth2.get_current_user(_request(), token=token, db=db)
+
+    assert db.queries == 2
+
+
+def test_user_cache_skips_unusable_entries(user_cache, monkeypatch):
+    user = _user()
+    oauth2._cache_user(oauth2.schemas.TokenData(id=5, jti=None, exp=2**31), user)
+    oauth2._cache_user(oauth2.schemas.TokenData(id=5, jti="old", exp=1), user)
+    assert oauth2._user_cache == {}
+    assert oauth2._get_cached_user(None) is None
+
+    monkeypatch.setattr(oauth2.settings, "auth_user_cache_max_entries", 0)
+    oauth2._cache_user(oauth2.schemas.TokenData(id=5, jti="new", exp=2**31), user)
+    assert oauth2._user_cache == {}
+
+
+def test_user_cache_evicts_oldest_entry_when_full(user_cache, monkeypatch):
+    monkeypatch.setattr(oauth2.settings, "auth_user_cache_max_entries", 2)
+    for jti in ("a", "b", "c"):
+        oauth2._cache_user(oauth2.schemas.TokenData(id=5, jti=jti, exp=2**31), _user())
+
+    assert list(oauth2._user_cache) == ["b", "c"]
+
+
 def test_decode_token_rejects_non_dict_payload(monkeypatch):
     monkeypatch.setattr(oauth2.jwt, "decode", lambda *_args, **_kwargs: "not-a-dict")
     with pytest.raises(InvalidTokenError):
-        oauth2._decode_token("token-value")
+        oauth2.decode_token("token-value")
 
 
 def test_to_utc_datetime_variants():
@@ -76,20 +164,39 @@ def test_to_utc_datetime_variants():
         oauth2._to_utc_datetime("oops")
 
 
-def test_get_user_id_from_access_token_variants():
-    valid = oauth2.create_access_token({"user_id": 321})
-    assert oauth2.get_user_id_from_access_token(valid) == 321
+def test_request_access_token_data_decodes_once_per_request(monkeypatch):
+    token = oauth2.create_access_token({"user_id": 11})
+    other = oauth2.create_access_token({"user_id": 12})
+    request = _request()
+    decoded: list[str] = []
+    real_decode = oauth2._access_token_data
+
+    def counting_decode(raw):
+        decoded.append(raw)
+        return real_decode(raw)
 
-    assert oauth2.get_user_id_from_access_token("not-a-token") is None
+    monkeypatch.setattr(oauth2, "_access_token_data", counting_decode)
 
-    refresh_token = oauth2.create_refresh_token({"user_id": 321})
-    assert oauth2.get_user_id_from_access_token(refresh_token) is None
+    assert oauth2.request_access_token_data(request, token).id == 11
+    assert oauth2.request_access_token_data(request, token).id == 11
+    assert decoded == [token]
 
-    no_user_token = oauth2.create_access_token({})
-    assert oauth2.get_user_id_from_access_token(no_user_token) is None
+    assert oauth2.request_access_token_data(request, other).id == 12
+    assert oauth2.request_access_token_data(_request(), token).id == 11
+    assert decoded == [token, other, token]
 
-    bad_user_token = oauth2.create_access_token({"user_id": "not-int"})
-    assert oauth2.get_user_id_from_access_token(bad_user_token) is None
+    assert oauth2.request_access_token_data(request, "not-a-token") is None
+    assert oauth2.request_access_token_data(request, "not-a-token") is None
+    assert decoded[-1:] == ["not-a-token"] and len(decoded) == 4
+
+
+def test_build_refresh_token_returns_encoded_claims():
+    token, jti, expires_at = oauth2._build_refresh_token({"user_id": 7})
+
+    payload = oauth2.verify_refresh_token(token)
+    assert payload["jti"] == jti
+    assert payload["exp"] == expires_at
+    assert payload["user_id"] == 7
 
 
 def test_verify_access_token_rejects_wrong_token_type():
@@ -176,3 +283,60 @@ def test_rotate_refresh_token_rejects_unknown_and_expired(session):
 
     with pytest.raises(HTTPException):
         oauth2.rotate_refresh_token(session, pair.refresh_token)
+    session.refresh(token_row)
+    assert token_row.revoked is True
+    assert token_row.replaced_by_jti is None
+
+
+@pytest.mark.integration
+def test_rotate_refresh_token_commits_once(session, monkeypatch):
+    user = models.User(email=f"user_{uuid.uuid4().hex[:8]}@example.com", password="x")
+    session.add(user)
+    session.commit()
+    pair = oauth2.issue_token_pair(session, int(user.id))
+
+    commits = []
+    real_commit = session.commit
+    monkeypatch.setattr(session, "commit", lambda: commits.append(real_commit()))
+    rotated = oauth2.rotate_refresh_token(session, pair.refresh_token)
+
+    assert len(commits) == 1
+    new_jti = oauth2.verify_refresh_token(rotated.refresh_token)["jti"]
+    old_jti = oauth2.verify_refresh_token(pair.refresh_token)["jti"]
+    new_row = (
+        session.query(models.RefreshToken)
+        .filter(models.RefreshToken.jti == new_jti)
+        .one()
+    )
+    assert new_row.rotated_from_jti == old_jti
+
+
+@pytest.mark.integration
+def test_get_current_user_cache_hit_attaches_to_session(session, user_cache):
+    user = models.User(email=f"user_{uuid.uuid4().hex[:8]}@example.com", password="x")
+    session.add(user)
+    session.commit()
+    token = oauth2.create_access_token({"user_id": int(user.id)})
+
+    oauth2.get_current_user(_request(), token=token, db=session)
+    session.expunge_all()
+    cached = oauth2.get_current_user(_request(), token=token, db=session)
+
+    assert cached in session
+    assert cached.id == user.id
+    assert cached.email == user.email
+
+
+@pytest.mark.integration
+def test_get_current_user_defers_password_hash(session, user_cache):
+    user = models.User(email=f"user_{uuid.uuid4().hex[:8]}@example.com", password="x")
+    session.add(user)
+    session.commit()
+    token = oauth2.create_access_token({"user_id": int(user.id)})
+    session.expunge_all()
+
+    loaded = oauth2.get_current_user(_request(), token=token, db=session)
+    cached = oauth2._get_cached_user(oauth2.verify_access_token(token, None).jti)
+
+    assert "password" in sa_inspect(loaded).unloaded
+    assert "password" not in cached.__dict__
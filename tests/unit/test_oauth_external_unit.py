@@ -1,15 +1,21 @@
 from __future__ import annotations
 
+import asyncio
+import base64
+import threading
 from datetime import datetime, timedelta, timezone
+from types import MappingProxyType
 from typing import Any
 from urllib.parse import parse_qs, urlparse
 
 import httpx
+import jwt
+import orjson
 import pytest
 from app import models, oauth_external
 from app.config import settings
 from fastapi import HTTPException
-from jwt import PyJWTError
+from sqlalchemy import event, select
 from starlette.requests import Request
 
 pytestmark = pytest.mark.unit
@@ -21,10 +27,35 @@ class DummyResponse:
         self._payload = payload
         self._invalid_json = invalid_json
 
-    def json(self):
+    @property
+    def content(self) -> bytes:
         if self._invalid_json:
-            raise ValueError("invalid json")
-        return self._payload
+            return b"not json"
+        return orjson.dumps(self._payload)
+
+
+class FakeHTTPClient:
+    def __init__(self, *, get=None, post=None):
+        self._get = get
+        self._post = post
+
+    async def get(self, *args, **kwargs):
+        return self._get(*args, **kwargs)
+
+    async def post(self, *args, **kwargs):
+        return self._post(*args, **kwargs)
+
+
+def _returning(value):
+    async def _fake(*_args, **_kwargs):
+        return value
+
+    return _fake
+
+
+def _use_http(monkeypatch, *, get=None, post=None):
+    client = FakeHTTPClient(get=get, post=post)
+    monkeypatch.setattr(oauth_external, "_http_client", lambda: client)
 
 
 @pytest.fixture(autouse=True)
@@ -72,6 +103,7 @@ def _enable_provider(monkeypatch, provider: str) -> None:
         f"oauth_{provider}_client_secret",
         f"{provider}-client-secret",
     )
+    oauth_external.refresh_provider_credentials()
 
 
 def test_get_provider_rejects_unsupported():
@@ -100,6 +132,20 @@ def test_list_enabled_providers(monkeypatch):
     assert {provider.provider for provider in providers} == {"google", "github"}
 
 
+def test_provider_credentials_are_resolved_once(monkeypatch):
+    _enable_provider(monkeypatch, "google")
+    assert oauth_external._provider_credentials("google") == (
+        "google-client-id",
+        "google-client-secret",
+    )
+
+    monkeypatch.setattr(settings, "oauth_google_client_id", "rotated-id")
+    assert oauth_external._provider_credentials("google")[0] == "google-client-id"
+
+    oauth_external.refresh_provider_credentials()
+    assert oauth_external._provider_credentials("google")[0] == "rotated-id"
+
+
 def test_build_and_parse_oauth_state_round_trip():
     state = oauth_external.build_oauth_state(
         provider="google",
@@ -112,6 +158,48 @@ def test_build_and_parse_oauth_state_round_trip():
     assert parsed.redirect_to_frontend is True
 
 
+def _fresh_state(provider="google"):
+    return oauth_external.build_oauth_state(
+        provider=provider,
+        code_verifier="verifier",
+        redirect_to_frontend=False,
+    )
+
+
+def test_parse_oauth_state_rejects_replay():
+    state = _fresh_state()
+    oauth_external.parse_oauth_state(state, expected_provider="google")
+
+    with pytest.raises(HTTPException) as exc_info:
+        oauth_external.parse_oauth_state(state, expected_provider="google")
+    assert exc_info.value.detail["error_code"] == "invalid_oauth_state"
+
+    oauth_external.clear_consumed_oauth_states()
+    oauth_external.parse_oauth_state(state, expected_provider="google")
+
+
+def test_parse_oauth_state_rejects_concurrent_replay(monkeypatch):
+    # Simulate a second request winning the race between the pre-check and consume.
+    monkeypatch.setattr(oauth_external, "_consume_state", lambda *_args: False)
+    with pytest.raises(HTTPException) as exc_info:
+        oauth_external.parse_oauth_state(_fresh_state(), expected_provider="google")
+    assert exc_info.value.detail["detail"] == "OAuth state was already used"
+
+
+def test_consume_state_is_bounded_and_can_be_disabled(monkeypatch):
+    oauth_external.clear_consumed_oauth_states()
+    monkeypatch.setattr(settings, "oauth_state_replay_max_entries", 2)
+    expires_at = oauth_external.time.time() + 60
+    for digest in (b"a", b"b", b"c"):
+        assert oauth_external._consume_state(digest, expires_at) is True
+    assert list(oauth_external._consumed_states) == [b"b", b"c"]
+    assert oauth_external._consume_state(b"c", expires_at) is False
+
+    monkeypatch.setattr(settings, "oauth_state_replay_max_entries", 0)
+    assert oauth_external._consume_state(b"c", expires_at) is True
+    oauth_external.clear_consumed_oauth_states()
+
+
 def test_build_and_parse_oauth_state_with_link_user_id():
     state = oauth_external.build_oauth_state(
         provider="github",
@@ -141,7 +229,7 @@ def test_parse_oauth_state_rejects_provider_mismatch():
 
 
 def test_parse_oauth_state_rejects_wrong_token_type():
-    token = oauth_external.jwt.encode(
+    token = jwt.encode(
         {
             "token_type": "not_oauth_state",
             "iss": oauth_external.oauth2.TOKEN_ISSUER,
@@ -159,7 +247,7 @@ def test_parse_oauth_state_rejects_wrong_token_type():
 
 
 def test_parse_oauth_state_rejects_non_string_code_verifier(monkeypatch):
-    token = oauth_external.jwt.encode(
+    token = jwt.encode(
         {
             "token_type": "oauth_state",
             "iss": oauth_external.oauth2.TOKEN_ISSUER,
@@ -177,7 +265,7 @@ def test_parse_oauth_state_rejects_non_string_code_verifier(monkeypatch):
 
 
 def test_parse_oauth_state_rejects_invalid_link_user_id_type():
-    token = oauth_external.jwt.encode(
+    token = jwt.encode(
         {
             "token_type": "oauth_state",
             "iss": oauth_external.oauth2.TOKEN_ISSUER,
@@ -196,7 +284,7 @@ def test_parse_oauth_state_rejects_invalid_link_user_id_type():
 
 
 def test_parse_oauth_state_rejects_non_positive_link_user_id():
-    token = oauth_external.jwt.encode(
+    token = jwt.encode(
         {
             "token_type": "oauth_state",
             "iss": oauth_external.oauth2.TOKEN_ISSUER,
@@ -233,6 +321,45 @@ def test_build_authorization_url_google(monkeypatch, fake_request):
     assert state.link_user_id is None
 
 
+def test_build_authorization_url_reuses_static_query(monkeypatch, fake_request):
+    _enable_provider(monkeypatch, "google")
+    first = oauth_external.build_authorization_url(
+        "google", fake_request, redirect_to_frontend=False
+    )
+    second = oauth_external.build_authorization_url(
+        "google", fake_request, redirect_to_frontend=False
+    )
+    assert oauth_external._static_authorize_query.cache_info().hits >= 1
+    assert (
+        parse_qs(urlparse(first).query)["state"]
+        != parse_qs(urlparse(second).query)["state"]
+    )
+
+    monkeypatch.setattr(settings, "oauth_google_client_id", "rotated-id")
+    oauth_external.refresh_provider_credentials()
+    rotated = oauth_external.build_authorization_url(
+        "google", fake_request, redirect_to_frontend=False
+    )
+    assert parse_qs(urlparse(rotated).query)["client_id"] == ["rotated-id"]
+
+
+def test_build_code_challenge_matches_rfc7636_vector():
+    verifier = "dBjftJeZ4CVP-mB92K27uhbUJU1p1r_wW1gFWFOEjXk"
+    assert (
+        oauth_external._build_code_challenge(verifier)
+        == "E9Melhoa2OwvFrEMTJguCHaoeK1t8URWbuGJSstw-cM"
+    )
+
+
+def test_build_code_verifier_is_unpadded_base64url():
+    verifier = oauth_external._build_code_verifier()
+    assert len(verifier) == 64
+    assert "=" not in verifier
+    assert set(verifier) <= set(
+        "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+    )
+
+
 def test_build_authorization_url_with_link_user_id(monkeypatch, fake_request):
     _enable_provider(monkeypatch, "github")
     url = oauth_external.build_authorization_url(
@@ -251,6 +378,7 @@ def test_build_authorization_url_with_link_user_id(monkeypatch, fake_request):
 def test_build_authorization_url_uses_public_base(monkeypatch, fake_request):
     _enable_provider(monkeypatch, "google")
     monkeypatch.setattr(settings, "oauth_public_base_url", "https://api.example.com")
+    oauth_external.refresh_provider_credentials()
     url = oauth_external.build_authorization_url(
         "google", fake_request, redirect_to_frontend=True
     )
@@ -274,19 +402,20 @@ def test_exchange_code_for_token_google_success(monkeypatch, fake_request):
 
     captured: dict[str, Any] = {}
 
-    def fake_post(url: str, *, data: dict[str, str], headers: dict[str, str], timeout: float):
+    def fake_post(url: str, *, data: dict[str, str], headers: dict[str, str]):
         captured["url"] = url
         captured["data"] = data
         captured["headers"] = headers
-        captured["timeout"] = timeout
         return DummyResponse(200, {"access_token": "token-123"})
 
-    monkeypatch.setattr(oauth_external.httpx, "post", fake_post)
-    payload = oauth_external._exchange_code_for_token(
-        "google",
-        fake_request,
-        code="code-123",
-        code_verifier="verifier-123",
+    _use_http(monkeypatch, post=fake_post)
+    payload = asyncio.run(
+        oauth_external._exchange_code_for_token(
+            "google",
+            fake_request,
+            code="code-123",
+            code_verifier="verifier-123",
+        )
     )
     assert payload["access_token"] == "token-123"
     assert captured["data"]["grant_type"] == "authorization_code"
@@ -297,33 +426,76 @@ def test_exchange_code_for_token_github_omits_grant_type(monkeypatch, fake_reque
 
     captured: dict[str, Any] = {}
 
-    def fake_post(url: str, *, data: dict[str, str], headers: dict[str, str], timeout: float):
+    def fake_post(url: str, *, data: dict[str, str], headers: dict[str, str]):
         captured["data"] = data
         return DummyResponse(200, {"access_token": "token-123"})
 
-    monkeypatch.setattr(oauth_external.httpx, "post", fake_post)
-    oauth_external._exchange_code_for_token(
-        "github",
-        fake_request,
-        code="code-123",
-        code_verifier="verifier-123",
+    _use_http(monkeypatch, post=fake_post)
+    asyncio.run(
+        oauth_external._exchange_code_for_token(
+            "github",
+            fake_request,
+            code="code-123",
+            code_verifier="verifier-123",
+        )
     )
     assert "grant_type" not in captured["data"]
 
 
+def test_exchange_code_for_token_reuses_static_fields(monkeypatch, fake_request):
+    _enable_provider(monkeypatch, "github")
+
+    sent: list[tuple[dict[str, str], dict[str, str]]] = []
+
+    def fake_post(url: str, *, data: dict[str, str], headers: dict[str, str]):
+        sent.append((data, headers))
+        return DummyResponse(200, {"access_token": "token-123"})
+
+    _use_http(monkeypatch, post=fake_post)
+    for code in ("code-1", "code-2"):
+        asyncio.run(
+            oauth_external._exchange_code_for_token(
+                "github", fake_request, code=code, code_verifier="verifier-123"
+            )
+        )
+
+    assert [data["code"] for data, _ in sent] == ["code-1", "code-2"]
+    assert sent[0][1]["X-GitHub-Api-Version"] == "2022-11-28"
+    assert "code" not in oauth_external._static_token_fields("github")
+    assert oauth_external._static_token_fields.cache_info().misses == 1
+
+
+def test_exchange_code_for_token_parses_raw_response_bytes(monkeypatch, fake_request):
+    _enable_provider(monkeypatch, "google")
+    _use_http(
+        monkeypatch,
+        post=lambda *_args, **_kwargs: httpx.Response(
+            200, content=b'{"access_token": "token-\xc3\xa9", "expires_in": 3599}'
+        ),
+    )
+    payload = asyncio.run(
+        oauth_external._exchange_code_for_token(
+            "google", fake_request, code="code-123", code_verifier="verifier-123"
+        )
+    )
+    assert payload == {"access_token": "token-\u00e9", "expires_in": 3599}
+
+
 def test_exchange_code_for_token_handles_network_error(monkeypatch, fake_request):
     _enable_provider(monkeypatch, "google")
 
     def fake_post(*_args, **_kwargs):
         raise httpx.HTTPError("boom")
 
-    monkeypatch.setattr(oauth_external.httpx, "post", fake_post)
+    _use_http(monkeypatch, post=fake_post)
     with pytest.raises(HTTPException) as exc_info:
-        oauth_external._exchange_code_for_token(
-            "google",
-            fake_request,
-            code="code-123",
-            code_verifier="verifier-123",
+        asyncio.run(
+            oauth_external._exchange_code_for_token(
+                "google",
+                fake_request,
+                code="code-123",
+                code_verifier="verifier-123",
+            )
         )
     assert exc_info.value.status_code == 502
 
@@ -334,13 +506,15 @@ def test_exchange_code_for_token_handles_error_response(monkeypatch, fake_reques
     def fake_post(*_args, **_kwargs):
         return DummyResponse(400, {"error": "invalid_grant"})
 
-    monkeypatch.setattr(oauth_external.httpx, "post", fake_post)
+    _use_http(monkeypatch, post=fake_post)
     with pytest.raises(HTTPException) as exc_info:
-        oauth_external._exchange_code_for_token(
-            "google",
-            fake_request,
-            code="code-123",
-            code_verifier="verifier-123",
+        asyncio.run(
+            oauth_external._exchange_code_for_token(
+                "google",
+                fake_request,
+                code="code-123",
+                code_verifier="verifier-123",
+            )
         )
     assert exc_info.value.detail["error_code"] == "oauth_exchange_failed"
 
@@ -351,13 +525,15 @@ def test_exchange_code_for_token_rejects_missing_access_token(monkeypatch, fake_
     def fake_post(*_args, **_kwargs):
         return DummyResponse(200, {"token_type": "bearer"})
 
-    monkeypatch.setattr(oauth_external.httpx, "post", fake_post)
+    _use_http(monkeypatch, post=fake_post)
     with pytest.raises(HTTPException) as exc_info:
-        oauth_external._exchange_code_for_token(
-            "google",
-            fake_request,
-            code="code-123",
-            code_verifier="verifier-123",
+        asyncio.run(
+            oauth_external._exchange_code_for_token(
+                "google",
+                fake_request,
+                code="code-123",
+                code_verifier="verifier-123",
+            )
         )
     assert exc_info.value.status_code == 502
 
@@ -368,13 +544,15 @@ def test_exchange_code_for_token_handles_non_json_response(monkeypatch, fake_req
     def fake_post(*_args, **_kwargs):
         return DummyResponse(200, None, invalid_json=True)
 
-    monkeypatch.setattr(oauth_external.httpx, "post", fake_post)
+    _use_http(monkeypatch, post=fake_post)
     with pytest.raises(HTTPException) as exc_info:
-        oauth_external._exchange_code_for_token(
-            "google",
-            fake_request,
-            code="code-123",
-            code_verifier="verifier-123",
+        asyncio.run(
+            oauth_external._exchange_code_for_token(
+                "google",
+                fake_request,
+                code="code-123",
+                code_verifier="verifier-123",
+            )
         )
     assert exc_info.value.status_code == 502
 
@@ -383,8 +561,10 @@ def test_fetch_json_success(monkeypatch):
     def fake_get(*_args, **_kwargs):
         return DummyResponse(200, {"hello": "world"})
 
-    monkeypatch.setattr(oauth_external.httpx, "get", fake_get)
-    payload = oauth_external._fetch_json("https://example.com", access_token="token")
+    _use_http(monkeypatch, get=fake_get)
+    payload = asyncio.run(
+        oauth_external._fetch_json("https://example.com", access_token="token")
+    )
     assert payload == {"hello": "world"}
 
 
@@ -395,11 +575,13 @@ def test_fetch_json_includes_custom_headers(monkeypatch):
         captured["headers"] = kwargs["headers"]
         return DummyResponse(200, {"ok": True})
 
-    monkeypatch.setattr(oauth_external.httpx, "get", fake_get)
-    payload = oauth_external._fetch_json(
-        "https://example.com",
-        access_token="token",
-        headers={"X-Test": "yes"},
+    _use_http(monkeypatch, get=fake_get)
+    payload = asyncio.run(
+        oauth_external._fetch_json(
+            "https://example.com",
+            access_token="token",
+            headers={"X-Test": "yes"},
+        )
     )
     assert payload == {"ok": True}
     assert captured["headers"]["Authorization"] == "Bearer token"
@@ -418,9 +600,11 @@ def test_fetch_json_rejects_invalid_responses(monkeypatch, response):
     def fake_get(*_args, **_kwargs):
         return response
 
-    monkeypatch.setattr(oauth_external.httpx, "get", fake_get)
+    _use_http(monkeypatch, get=fake_get)
     with pytest.raises(HTTPException) as exc_info:
-        oauth_external._fetch_json("https://example.com", access_token="token")
+        asyncio.run(
+            oauth_external._fetch_json("https://example.com", access_token="token")
+        )
     assert exc_info.value.status_code == 502
 
 
@@ -428,9 +612,11 @@ def test_fetch_json_handles_network_error(monkeypatch):
     def fake_get(*_args, **_kwargs):
         raise httpx.HTTPError("network")
 
-    monkeypatch.setattr(oauth_external.httpx, "get", fake_get)
+    _use_http(monkeypatch, get=fake_get)
     with pytest.raises(HTTPException) as exc_info:
-        oauth_external._fetch_json("https://example.com", access_token="token")
+        asyncio.run(
+            oauth_external._fetch_json("https://example.com", access_token="token")
+        )
     assert exc_info.value.status_code == 502
 
 
@@ -441,9 +627,12 @@ def test_fetch_json_handles_network_error(monkeypatch):
         (False, False),
         ("true", True),
         ("1", True),
+        ("YES", True),
         ("no", False),
+        ("t", False),
         (1, True),
         (0, False),
+        (1.0, False),
         (None, False),
     ],
 )
@@ -451,44 +640,54 @@ def test_to_bool(value, expected):
     assert oauth_external._to_bool(value) is expected
 
 
-def test_get_identity_from_apple_success(monkeypatch):
-    monkeypatch.setattr(
-        oauth_external.jwt,
-        "decode",
-        lambda *_args, **_kwargs: {
-            "sub": "apple-sub",
-            "email": "apple@example.com",
-            "email_verified": "true",
-        },
+def _apple_id_token(claims: Any) -> str:
+    body = base64.urlsafe_b64encode(orjson.dumps(claims)).rstrip(b"=").decode("ascii")
+    return f"eyJhbGciOiJSUzI1NiJ9.{body}.signature"
+
+
+def test_get_identity_from_apple_success():
+    identity = oauth_external._get_identity_from_apple(
+        {
+            "id_token": _apple_id_token(
+                {
+                    "sub": "apple-sub",
+                    "email": "apple@example.com",
+                    "email_verified": "true",
+                }
+            )
+        }
     )
-    identity = oauth_external._get_identity_from_apple({"id_token": "id-token"})
     assert identity.provider == "apple"
     assert identity.subject == "apple-sub"
     assert identity.email == "apple@example.com"
     assert identity.email_verified is True
 
 
+def test_get_identity_from_apple_matches_pyjwt_unverified_decode():
+    token = jwt.encode({"sub": "apple-sub", "email": "a@example.com"}, "k" * 32)
+    identity = oauth_external._get_identity_from_apple({"id_token": token})
+    claims = jwt.decode(token, options={"verify_signature": False})
+    assert (identity.subject, identity.email) == (claims["sub"], claims["email"])
+
+
 @pytest.mark.parametrize(
-    "payload,patcher",
+    "payload",
     [
-        ({}, None),
-        ({"id_token": "id-token"}, lambda: (_ for _ in ()).throw(PyJWTError("bad"))),
-        ({"id_token": "id-token"}, lambda: {"email": "missing-sub@example.com"}),
+        {},
+        {"id_token": "id-token"},
+        {"id_token": "a.b.c.d"},
+        {"id_token": "header.%%%.signature"},
+        {"id_token": "header.bm90LWpzb24.signature"},
+        {"id_token": "header.\u00e9.signature"},
+        {"id_token": _apple_id_token({"email": "missing-sub@example.com"})},
+        {"id_token": _apple_id_token(["not-dict"])},
     ],
 )
-def test_get_identity_from_apple_error_cases(monkeypatch, payload, patcher):
-    if patcher is not None:
-        monkeypatch.setattr(oauth_external.jwt, "decode", lambda *_args, **_kwargs: patcher())
+def test_get_identity_from_apple_error_cases(payload):
     with pytest.raises(HTTPException):
         oauth_external._get_identity_from_apple(payload)
 
 
-def test_get_identity_from_apple_rejects_non_dict_claims(monkeypatch):
-    monkeypatch.setattr(oauth_external.jwt, "decode", lambda *_args, **_kwargs: ["not-dict"])
-    with pytest.raises(HTTPException):
-        oauth_external._get_identity_from_apple({"id_token": "id-token"})
-
-
 def test_select_github_email_prefers_primary_verified(monkeypatch):
     def fake_get(*_args, **_kwargs):
         return DummyResponse(
@@ -499,8 +698,8 @@ def test_select_github_email_prefers_primary_verified(monkeypatch):
             ],
         )
 
-    monkeypatch.setattr(oauth_external.httpx, "get", fake_get)
-    email, verified = oauth_external._select_github_email("token")
+    _use_http(monkeypatch, get=fake_get)
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
     assert email == "primary@example.com"
     assert verified is True
 
@@ -509,50 +708,46 @@ def test_select_github_email_handles_failure(monkeypatch):
     def fake_get(*_args, **_kwargs):
         raise httpx.HTTPError("nope")
 
-    monkeypatch.setattr(oauth_external.httpx, "get", fake_get)
-    email, verified = oauth_external._select_github_email("token")
+    _use_http(monkeypatch, get=fake_get)
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
     assert email is None
     assert verified is False
 
 
 def test_select_github_email_handles_error_status(monkeypatch):
-    monkeypatch.setattr(
-        oauth_external.httpx,
-        "get",
-        lambda *_args, **_kwargs: DummyResponse(500, {"error": "boom"}),
+    _use_http(
+        monkeypatch,
+        get=lambda *_args, **_kwargs: DummyResponse(500, {"error": "boom"}),
     )
-    email, verified = oauth_external._select_github_email("token")
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
     assert email is None
     assert verified is False
 
 
 def test_select_github_email_handles_invalid_json(monkeypatch):
-    monkeypatch.setattr(
-        oauth_external.httpx,
-        "get",
-        lambda *_args, **_kwargs: DummyResponse(200, None, invalid_json=True),
+    _use_http(
+        monkeypatch,
+        get=lambda *_args, **_kwargs: DummyResponse(200, None, invalid_json=True),
     )
-    email, verified = oauth_external._select_github_email("token")
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
     assert email is None
     assert verified is False
 
 
 def test_select_github_email_handles_non_list_payload(monkeypatch):
-    monkeypatch.setattr(
-        oauth_external.httpx,
-        "get",
-        lambda *_args, **_kwargs: DummyResponse(200, {"not": "a-list"}),
+    _use_http(
+        monkeypatch,
+        get=lambda *_args, **_kwargs: DummyResponse(200, {"not": "a-list"}),
     )
-    email, verified = oauth_external._select_github_email("token")
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
     assert email is None
     assert verified is False
 
 
 def test_select_github_email_uses_verified_fallback(monkeypatch):
-    monkeypatch.setattr(
-        oauth_external.httpx,
-        "get",
-        lambda *_args, **_kwargs: DummyResponse(
+    _use_http(
+        monkeypatch,
+        get=lambda *_args, **_kwargs: DummyResponse(
             200,
             [
                 {"email": "unverified@example.com", "verified": False, "primary": True},
@@ -560,16 +755,15 @@ def test_select_github_email_uses_verified_fallback(monkeypatch):
             ],
         ),
     )
-    email, verified = oauth_external._select_github_email("token")
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
     assert email == "verified@example.com"
     assert verified is True
 
 
 def test_select_github_email_primary_with_empty_email_returns_none(monkeypatch):
-    monkeypatch.setattr(
-        oauth_external.httpx,
-        "get",
-        lambda *_args, **_kwargs: DummyResponse(
+    _use_http(
+        monkeypatch,
+        get=lambda *_args, **_kwargs: DummyResponse(
             200,
             [
                 {"email": "", "verified": True, "primary": True},
@@ -577,16 +771,37 @@ def test_select_github_email_primary_with_empty_email_returns_none(monkeypatch):
             ],
         ),
     )
-    email, verified = oauth_external._select_github_email("token")
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
     assert email is None
     assert verified is False
 
 
+def test_select_github_email_empty_primary_falls_back_to_earlier_verified(monkeypatch):
+    _use_http(
+        monkeypatch,
+        get=lambda *_args, **_kwargs: DummyResponse(
+            200,
+            [
+                {
+                    "email": "unverified@example.com",
+                    "verified": False,
+                    "primary": False,
+                },
+                {"email": "secondary@example.com", "verified": True, "primary": False},
+                {"email": " ", "verified": True, "primary": True},
+                {"email": "later@example.com", "verified": True, "primary": True},
+            ],
+        ),
+    )
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
+    assert email == "secondary@example.com"
+    assert verified is True
+
+
 def test_select_github_email_returns_none_when_no_usable_verified_emails(monkeypatch):
-    monkeypatch.setattr(
-        oauth_external.httpx,
-        "get",
-        lambda *_args, **_kwargs: DummyResponse(
+    _use_http(
+        monkeypatch,
+        get=lambda *_args, **_kwargs: DummyResponse(
             200,
             [
                 {"email": "", "verified": False, "primary": True},
@@ -594,16 +809,15 @@ def test_select_github_email_returns_none_when_no_usable_verified_emails(monkeyp
             ],
         ),
     )
-    email, verified = oauth_external._select_github_email("token")
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
     assert email is None
     assert verified is False
 
 
 def test_select_github_email_returns_none_when_no_verified_candidates(monkeypatch):
-    monkeypatch.setattr(
-        oauth_external.httpx,
-        "get",
-        lambda *_args, **_kwargs: DummyResponse(
+    _use_http(
+        monkeypatch,
+        get=lambda *_args, **_kwargs: DummyResponse(
             200,
             [
                 {"email": "first@example.com", "verified": False, "primary": True},
@@ -611,7 +825,7 @@ def test_select_github_email_returns_none_when_no_verified_candidates(monkeypatc
             ],
         ),
     )
-    email, verified = oauth_external._select_github_email("token")
+    email, verified = asyncio.run(oauth_external._select_github_email("token"))
     assert email is None
     assert verified is False
 
@@ -647,15 +861,19 @@ def test_fetch_external_identity_generic_providers(monkeypatch, provider):
     monkeypatch.setattr(
         oauth_external,
         "_fetch_json",
-        lambda *_args, **_kwargs: {
-            "sub": "sub-123",
-            "id": "123",
-            "email": "user@example.com",
-            "email_verified": True,
-        },
+        _returning(
+            {
+                "sub": "sub-123",
+                "id": "123",
+                "email": "user@example.com",
+                "email_verified": True,
+            }
+        ),
     )
     token_payload = {"access_token": "token"}
-    identity = oauth_external.fetch_external_identity(provider, token_payload)
+    identity = asyncio.run(
+        oauth_external.fetch_external_identity(provider, token_payload)
+    )
     assert identity.email == "user@example.com"
 
 
@@ -664,14 +882,16 @@ def test_fetch_external_identity_github_fallback_email(monkeypatch):
     monkeypatch.setattr(
         oauth_external,
         "_fetch_json",
-        lambda *_args, **_kwargs: {"id": 1234},
+        _returning({"id": 1234}),
     )
     monkeypatch.setattr(
         oauth_external,
         "_select_github_email",
-        lambda _token: ("gh@example.com", True),
+        _returning(("gh@example.com", True)),
+    )
+    identity = asyncio.run(
+        oauth_external.fetch_external_identity("github", {"access_token": "token"})
     )
-    identity = oauth_external.fetch_external_identity("github", {"access_token": "token"})
     assert identity.subject == "1234"
     assert identity.email == "gh@example.com"
 
@@ -681,9 +901,11 @@ def test_fetch_external_identity_github_keeps_primary_email(monkeypatch):
     monkeypatch.setattr(
         oauth_external,
         "_fetch_json",
-        lambda *_args, **_kwargs: {"id": 5678, "email": "present@example.com"},
+        _returning({"id": 5678, "email": "present@example.com"}),
+    )
+    identity = asyncio.run(
+        oauth_external.fetch_external_identity("github", {"access_token": "token"})
     )
-    identity = oauth_external.fetch_external_identity("github", {"access_token": "token"})
     assert identity.email == "present@example.com"
 
 
@@ -699,29 +921,55 @@ def test_fetch_external_identity_apple(monkeypatch):
             email_verified=True,
         ),
     )
-    identity = oauth_external.fetch_external_identity("apple", {"access_token": "token"})
+    identity = asyncio.run(
+        oauth_external.fetch_external_identity("apple", {"access_token": "token"})
+    )
     assert identity.subject == "apple-sub"
 
 
+def test_provider_registries_are_read_only():
+    with pytest.raises(TypeError):
+        oauth_external._PROVIDERS["evil"] = oauth_external._PROVIDERS["google"]  # type: ignore[index]
+    with pytest.raises(TypeError):
+        oauth_external._PROVIDER_CREDENTIAL_ATTRS["evil"] = ("a", "b")  # type: ignore[index]
+
+
 def test_fetch_external_identity_rejects_missing_profile_endpoint(monkeypatch):
     _enable_provider(monkeypatch, "google")
-    monkeypatch.setitem(
-        oauth_external._PROVIDERS,
-        "google",
-        oauth_external.OAuthProviderConfig(
-            provider="google",
-            display_name="Google",
-            authorize_url="https://accounts.google.com/o/oauth2/v2/auth",
-            token_url="https://oauth2.googleapis.com/token",
-            scopes=("openid", "email", "profile"),
-            userinfo_url=None,
+    monkeypatch.setattr(
+        oauth_external,
+        "_PROVIDERS",
+        MappingProxyType(
+            {
+                **oauth_external._PROVIDERS,
+                "google": oauth_external.OAuthProviderConfig(
+                    provider="google",
+                    display_name="Google",
+                    authorize_url="https://accounts.google.com/o/oauth2/v2/auth",
+                    token_url="https://oauth2.googleapis.com/token",
+                    scopes=("openid", "email", "profile"),
+                    userinfo_url=None,
+                ),
+            }
         ),
     )
     with pytest.raises(HTTPException) as exc_info:
-        oauth_external.fetch_external_identity("google", {"access_token": "token"})
+        asyncio.run(
+            oauth_external.fetch_external_identity("google", {"access_token": "token"})
+        )
     assert exc_info.value.status_code == 502
 
 
+def test_account_touch_values_only_overwrite_email_when_present():
+    now = datetime.now(timezone.utc)
+
+    assert oauth_external._account_touch_values("user@example.com", now) == {
+        "last_login_at": now,
+        "provider_email": "user@example.com",
+    }
+    assert oauth_external._account_touch_values(None, now) == {"last_login_at": now}
+
+
 @pytest.mark.integration
 def test_find_or_create_user_for_identity_creates_user_and_account(session):
     identity = oauth_external.ExternalIdentity(
@@ -802,6 +1050,7 @@ def test_find_or_create_user_for_identity_uses_existing_account_and_updates(sess
     )
     assert updated is not None
     assert updated.provider_email == "new@example.com"
+    assert updated.last_login_at > old_login
 
 
 @pytest.mark.integration
@@ -871,6 +1120,37 @@ def test_link_identity_to_existing_user_user_not_found(session):
     assert exc_info.value.status_code == 404
 
 
+@pytest.mark.integration
+def test_link_identity_to_existing_user_reuses_loaded_user(session):
+    user = models.User(email="loaded@example.com", password="hashed")
+    session.add(user)
+    session.commit()
+    session.refresh(user)
+
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        oauth_external._link_identity_to_existing_user(
+            session,
+            user_id=int(user.id),
+            identity=oauth_external.ExternalIdentity(
+                provider="github",
+                subject="loaded-subject",
+                email="loaded@example.com",
+                email_verified=True,
+            ),
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert not any("FROM users" in statement for statement in statements)
+
+
 @pytest.mark.integration
 def test_link_identity_to_existing_user_conflict_other_user(session):
     user_a = models.User(email="a@example.com", password="hashed")
@@ -963,6 +1243,42 @@ def test_link_identity_to_existing_user_idempotent_update(session):
     assert account.provider_email == "new@example.com"
 
 
+@pytest.mark.integration
+def test_link_identity_to_existing_user_ignores_other_users_provider_accounts(session):
+    user = models.User(email="link-target@example.com", password="hashed")
+    other = models.User(email="link-other@example.com", password="hashed")
+    session.add_all([user, other])
+    session.flush()
+    session.add(
+        models.OAuthAccount(
+            user_id=int(other.id),
+            provider="google",
+            provider_subject="other-subject",
+        )
+    )
+    session.commit()
+
+    identity = oauth_external.ExternalIdentity(
+        provider="google",
+        subject="target-subject",
+        email="link-target@example.com",
+        email_verified=True,
+    )
+    oauth_external._link_identity_to_existing_user(
+        session, user_id=int(user.id), identity=identity
+    )
+    session.commit()
+
+    subjects = set(
+        session.scalars(
+            select(models.OAuthAccount.provider_subject).where(
+                models.OAuthAccount.user_id == user.id
+            )
+        )
+    )
+    assert subjects == {"target-subject"}
+
+
 @pytest.mark.integration
 def test_link_identity_to_existing_user_idempotent_without_new_email(session):
     user = models.User(email="idempotent-no-email@example.com", password="hashed")
@@ -1024,6 +1340,46 @@ def test_link_identity_to_existing_user_creates_new_account(session):
     assert account.provider_subject == "fb-subject"
 
 
+def test_complete_oauth_callback_runs_db_work_off_the_event_loop(
+    monkeypatch, fake_request
+):
+    identity = oauth_external.ExternalIdentity(
+        provider="google", subject="subject-thread", email=None, email_verified=False
+    )
+    threads: dict[str, int] = {}
+
+    async def fake_exchange(*_args, **_kwargs):
+        threads["http"] = threading.get_ident()
+        return {"access_token": "oauth-provider-token"}
+
+    def fake_db_work(_db, **_kwargs):
+        threads["db"] = threading.get_ident()
+        return "result"
+
+    monkeypatch.setattr(oauth_external, "_exchange_code_for_token", fake_exchange)
+    monkeypatch.setattr(oauth_external, "fetch_external_identity", _returning(identity))
+    monkeypatch.setattr(oauth_external, "_complete_callback_in_db", fake_db_work)
+
+    result = asyncio.run(
+        oauth_external.complete_oauth_callback(
+            object(),
+            fake_request,
+            provider="google",
+            code="code",
+            state=oauth_external.OAuthState(
+                provider="google",
+                code_verifier="verifier",
+                redirect_to_frontend=False,
+                link_user_id=None,
+            ),
+        )
+    )
+
+    assert result == "result"
+    assert threads["http"] == threading.get_ident()
+    assert threads["db"] != threading.get_ident()
+
+
 @pytest.mark.integration
 def test_complete_oauth_callback_returns_token_result(session, monkeypatch, fake_request):
     user = models.User(email="callback@example.com", password="hashed")
@@ -1033,29 +1389,33 @@ def test_complete_oauth_callback_returns_token_result(session, monkeypatch, fake
     monkeypatch.setattr(
         oauth_external,
         "_exchange_code_for_token",
-        lambda *_args, **_kwargs: {"access_token": "oauth-provider-token"},
+        _returning({"access_token": "oauth-provider-token"}),
     )
     monkeypatch.setattr(
         oauth_external,
         "fetch_external_identity",
-        lambda *_args, **_kwargs: oauth_external.ExternalIdentity(
-            provider="google",
-            subject="subject-123",
-            email="callback@example.com",
-            email_verified=True,
+        _returning(
+            oauth_external.ExternalIdentity(
+                provider="google",
+                subject="subject-123",
+                email="callback@example.com",
+                email_verified=True,
+            )
         ),
     )
 
-    result = oauth_external.complete_oauth_callback(
-        session,
-        fake_request,
-        provider="google",
-        code="code-123",
-        state=oauth_external.OAuthState(
+    result = asyncio.run(
+        oauth_external.complete_oauth_callback(
+            session,
+            fake_request,
             provider="google",
-            code_verifier="verifier",
-            redirect_to_frontend=True,
-        ),
+            code="code-123",
+            state=oauth_external.OAuthState(
+                provider="google",
+                code_verifier="verifier",
+                redirect_to_frontend=True,
+            ),
+        )
     )
     assert result.redirect_to_frontend is True
     assert result.linked is False
@@ -1072,48 +1432,54 @@ def test_complete_oauth_callback_link_mode(session, monkeypatch, fake_request):
     monkeypatch.setattr(
         oauth_external,
         "_exchange_code_for_token",
-        lambda *_args, **_kwargs: {"access_token": "oauth-provider-token"},
+        _returning({"access_token": "oauth-provider-token"}),
     )
     monkeypatch.setattr(
         oauth_external,
         "fetch_external_identity",
-        lambda *_args, **_kwargs: oauth_external.ExternalIdentity(
-            provider="github",
-            subject="subject-link",
-            email="link-callback@example.com",
-            email_verified=True,
+        _returning(
+            oauth_external.ExternalIdentity(
+                provider="github",
+                subject="subject-link",
+                email="link-callback@example.com",
+                email_verified=True,
+            )
         ),
     )
 
-    result = oauth_external.complete_oauth_callback(
-        session,
-        fake_request,
-        provider="github",
-        code="code-123",
-        state=oauth_external.OAuthState(
-            provider="github",
-            code_verifier="verifier",
-            redirect_to_frontend=False,
-            link_user_id=int(user.id),
-        ),
-    )
-    assert result.linked is True
-    assert result.token is None
-
-
-def test_complete_oauth_callback_rejects_provider_state_mismatch(session, fake_request):
-    with pytest.raises(HTTPException) as exc_info:
+    result = asyncio.run(
         oauth_external.complete_oauth_callback(
             session,
             fake_request,
             provider="github",
             code="code-123",
             state=oauth_external.OAuthState(
-                provider="google",
+                provider="github",
                 code_verifier="verifier",
                 redirect_to_frontend=False,
+                link_user_id=int(user.id),
             ),
         )
+    )
+    assert result.linked is True
+    assert result.token is None
+
+
+def test_complete_oauth_callback_rejects_provider_state_mismatch(session, fake_request):
+    with pytest.raises(HTTPException) as exc_info:
+        asyncio.run(
+            oauth_external.complete_oauth_callback(
+                session,
+                fake_request,
+                provider="github",
+                code="code-123",
+                state=oauth_external.OAuthState(
+                    provider="google",
+                    code_verifier="verifier",
+                    redirect_to_frontend=False,
+                ),
+            )
+        )
     assert exc_info.value.status_code == 400
     assert exc_info.value.detail["error_code"] == "invalid_oauth_state"
 
@@ -1172,6 +1538,17 @@ def test_build_frontend_redirect_allows_origin_from_public_base(monkeypatch):
     assert redirect.startswith("https://api.example.com/frontend/callback#")
 
 
+def test_frontend_redirect_target_is_cached_until_refresh(monkeypatch):
+    monkeypatch.setattr(settings, "oauth_frontend_callback_url", "/first")
+    assert oauth_external.build_frontend_link_redirect("github").startswith("/first#")
+
+    monkeypatch.setattr(settings, "oauth_frontend_callback_url", "/second")
+    assert oauth_external.build_frontend_link_redirect("github").startswith("/first#")
+
+    oauth_external.refresh_provider_credentials()
+    assert oauth_external.build_frontend_link_redirect("github").startswith("/second#")
+
+
 def test_build_frontend_redirect_rejects_invalid_relative_path(monkeypatch):
     monkeypatch.setattr(settings, "oauth_frontend_callback_url", "frontend/callback")
     with pytest.raises(HTTPException) as exc_info:
@@ -1189,3 +1566,14 @@ def test_build_frontend_redirect_rejects_invalid_relative_path(monkeypatch):
 )
 def test_origin_from_url(url, expected):
     assert oauth_external._origin_from_url(url) == expected
+
+
+def test_http_client_is_shared_until_closed():
+    asyncio.run(oauth_external.close_http_client())
+    client = oauth_external._http_client()
+    assert oauth_external._http_client() is client
+
+    asyncio.run(oauth_external.close_http_client())
+    assert client.is_closed
+    assert oauth_external._http_client() is not client
+    asyncio.run(oauth_external.close_http_client())
@@ -1,4 +1,6 @@
+import asyncio
 import builtins
+import importlib
 import logging
 
 import pytest
@@ -26,10 +28,18 @@ def test_configure_structured_logging_success_and_idempotent(monkeypatch):
 
     assert observability.configure_structured_logging() is True
     assert observability.configure_structured_logging() is False
+    assert type(root.handlers[0].formatter).__module__.startswith("pythonjsonlogger")
 
-    delattr(root, "_json_logging_configured")
+
+def test_structured_logging_falls_back_without_json_logger(monkeypatch):
     _patch_import_error(monkeypatch, "pythonjsonlogger")
-    assert observability.configure_structured_logging() is True
+    try:
+        importlib.reload(observability)
+        assert observability._LOG_FORMATTER_CLASS is logging.Formatter
+    finally:
+        monkeypatch.undo()
+        importlib.reload(observability)
+    assert observability._LOG_FORMATTER_CLASS is not logging.Formatter
 
 
 def test_configure_metrics_paths(monkeypatch):
@@ -54,6 +64,9 @@ def test_configure_metrics_success(monkeypatch):
     app = FastAPI()
     assert observability.configure_metrics(app) is True
     assert observability._route_exists(app, "/metrics") is True
+    # The route lookup must see routes added after the first check, so a second
+    # call does not mount the metrics endpoint twice.
+    assert observability.configure_metrics(app) is False
 
 
 def test_configure_tracing_paths(monkeypatch):
@@ -143,3 +156,18 @@ def test_configure_observability_aggregates(monkeypatch):
     monkeypatch.setattr(observability, "configure_sentry", lambda: False)
     result = observability.configure_observability(app)
     assert result == {"logging": True, "metrics": False, "tracing": True, "sentry": False}
+
+
+def test_warn_if_default_event_loop(caplog):
+    uvloop = pytest.importorskip("uvloop")
+
+    with caplog.at_level(logging.WARNING, logger=observability.logger.name):
+        assert asyncio.run(_warn_async()) is True
+    assert "--loop uvloop" in caplog.text
+
+    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+        assert runner.run(_warn_async()) is False
+
+
+async def _warn_async():
+    return observability.warn_if_default_event_loop()
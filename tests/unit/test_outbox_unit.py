@@ -1,5 +1,7 @@
 import pytest
 from app import models, outbox
+from sqlalchemy import func, literal, select
+from sqlalchemy.orm import Session
 
 pytestmark = pytest.mark.integration
 
@@ -21,6 +23,63 @@ def test_enqueue_and_fetch_pending_outbox_events(session):
     assert limited[0].id == first.id
 
 
+def test_outbox_event_insert_queues_sql_payload(session):
+    session.execute(
+        outbox.outbox_event_insert(
+            "event.sql", func.json_build_object(literal("sequence"), 7)
+        )
+    )
+    session.execute(
+        outbox.outbox_event_insert(
+            "event.sql", func.json_build_object(literal("sequence"), 8)
+        )
+    )
+    session.commit()
+
+    queued = session.scalars(
+        select(models.OutboxEvent).order_by(models.OutboxEvent.id)
+    ).all()
+    assert [event.payload for event in queued] == [{"sequence": 7}, {"sequence": 8}]
+    assert {event.topic for event in queued} == {"event.sql"}
+    assert len({event.event_key for event in queued}) == 2
+
+
+def test_get_pending_outbox_events_skips_rows_claimed_elsewhere(session):
+    outbox.enqueue_outbox_events(
+        session, [("event.claim", {"sequence": 1}), ("event.claim", {"sequence": 2})]
+    )
+    session.commit()
+
+    claimed = outbox.get_pending_outbox_events(session, limit=1)
+    other = Session(bind=session.get_bind())
+    try:
+        remaining = outbox.get_pending_outbox_events(other, limit=10)
+        assert len(claimed) == len(remaining) == 1
+        assert remaining[0].id != claimed[0].id
+    finally:
+        other.rollback()
+        other.close()
+        session.rollback()
+
+
+def test_enqueue_outbox_events_inserts_batch(session):
+    queued = outbox.enqueue_outbox_events(
+        session,
+        [("event.batch", {"sequence": 1}), ("event.batch", {"sequence": 2})],
+    )
+    session.commit()
+
+    pending = outbox.get_pending_outbox_events(session, limit=10)
+    assert queued == 2
+    assert sorted(event.payload["sequence"] for event in pending) == [1, 2]
+    assert len({event.event_key for event in pending}) == 2
+
+
+def test_enqueue_outbox_events_ignores_empty_batch(session):
+    assert outbox.enqueue_outbox_events(session, []) == 0
+    assert outbox.get_pending_outbox_events(session) == []
+
+
 def test_mark_outbox_event_completed_and_failed(session):
     event = models.OutboxEvent(topic="event.topic", payload={"k": "v"}, attempts=0)
     session.add(event)
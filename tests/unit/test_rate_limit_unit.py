@@ -1,7 +1,13 @@
+import hashlib
+
 import pytest
-from app import rate_limit
-from fastapi import HTTPException, Response
-from redis.exceptions import RedisError
+from app import main, rate_limit, schemas
+from fastapi import APIRouter, FastAPI, HTTPException
+from fastapi.routing import APIRoute
+from fastapi.testclient import TestClient
+from redis.commands.core import Script
+from redis.connection import Encoder
+from redis.exceptions import NoScriptError, RedisError
 from starlette.requests import Request
 
 pytestmark = pytest.mark.unit
@@ -33,7 +39,20 @@ def test_policy_loading_and_key_generation():
     key = rate_limit.build_rate_limit_key(
         policies["api_read"], "user:42", now_seconds=60.0
     )
-    assert key.startswith("rl:api_read:1:")
+    assert key.startswith(b"rl:api_read:1:")
+    principal_hash = key.rsplit(b":", 1)[1]
+    assert principal_hash == rate_limit._principal_hash("user:42")
+    assert policies["api_read"].key_prefix == b"rl:api_read:"
+    assert (
+        policies["api_read"].window_arg == b"%d" % policies["api_read"].window_seconds
+    )
+    assert len(principal_hash) == 16
+    assert (
+        principal_hash
+        != rate_limit.build_rate_limit_key(
+            policies["api_read"], "user:43", now_seconds=60.0
+        ).rsplit(b":", 1)[1]
+    )
 
 
 def test_client_ip_resolution_and_principal(monkeypatch):
@@ -42,68 +61,125 @@ def test_client_ip_resolution_and_principal(monkeypatch):
     assert rate_limit._client_ip(request) == "10.1.1.1"
     invalid_proxy_request = _request(headers=[(b"x-forwarded-for", b"not-an-ip")])
     assert rate_limit._client_ip(invalid_proxy_request) == "127.0.0.1"
+    single_hop_request = _request(headers=[(b"x-forwarded-for", b" 2001:db8::1 ")])
+    assert rate_limit._client_ip(single_hop_request) == "2001:db8::1"
 
     no_client_request = _request(client=None)  # type: ignore[arg-type]
     assert rate_limit._client_ip(no_client_request) == "unknown"
 
     auth_request = _request(headers=[(b"authorization", b"Bearer token-value")])
-    monkeypatch.setattr(rate_limit.oauth2, "get_user_id_from_access_token", lambda _t: 7)
+    monkeypatch.setattr(
+        rate_limit.oauth2,
+        "request_access_token_data",
+        lambda _request, _token: schemas.TokenData(id=7),
+    )
     assert rate_limit._principal_for_request(auth_request) == "user:7"
 
     monkeypatch.setattr(
-        rate_limit.oauth2, "get_user_id_from_access_token", lambda _t: None
+        rate_limit.oauth2, "request_access_token_data", lambda _request, _token: None
     )
     assert rate_limit._principal_for_request(auth_request).startswith("ip:")
 
 
-def test_redis_rate_limiter_check_uses_eval_script():
-    class DummyRedis:
-        def eval(self, _script, _numkeys, _key, _window):
-            return [3, 22]
+class DummyRedis:
+    def __init__(self):
+        self.loaded: set[str] = set()
+        self.script_loads = 0
+        self.calls: list[tuple] = []
+
+    def get_encoder(self):
+        return Encoder("utf-8", "strict", False)
+
+    def register_script(self, script):
+        return Script(self, script)
+
+    def script_load(self, script):
+        self.script_loads += 1
+        sha = hashlib.sha1(script.encode("utf-8")).hexdigest()
+        self.loaded.add(sha)
+        return sha
 
-    limiter = rate_limit.RedisRateLimiter(redis_factory=lambda: DummyRedis())
+    def evalsha(self, sha, numkeys, *args):
+        if sha not in self.loaded:
+            raise NoScriptError("NOSCRIPT No matching script")
+        self.calls.append((numkeys, *args))
+        return [3] * numkeys
+
+
+def test_redis_rate_limiter_check_uses_cached_script(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "time", lambda: 158.0)
+    redis_client = DummyRedis()
+    limiter = rate_limit.RedisRateLimiter(redis_factory=lambda: redis_client)
     policy = rate_limit.RateLimitPolicy(name="api_read", limit=5, window_seconds=60)
     allowed, remaining, retry_after = limiter.check(policy, "user:1")
     assert allowed is True
     assert remaining == 2
     assert retry_after == 22
 
+    limiter.check(policy, "user:1")
+    assert redis_client.script_loads == 1
+    assert len(redis_client.calls) == 2
+    assert redis_client.calls[0][0] == 1
+    assert redis_client.calls[0][2] == b"60"
+
+
+def test_redis_rate_limiter_reregisters_script_for_new_client():
+    clients = [DummyRedis(), DummyRedis()]
+    limiter = rate_limit.RedisRateLimiter(redis_factory=lambda: clients[0])
+    policy = rate_limit.RateLimitPolicy(name="api_read", limit=5, window_seconds=60)
+    limiter.check(policy, "user:1")
+
+    clients.pop(0)
+    limiter.check(policy, "user:1")
+    assert clients[0].script_loads == 1
+    assert len(clients[0].calls) == 1
 
-def test_rate_limit_dependency_requires_known_policy():
-    with pytest.raises(ValueError):
-        rate_limit.rate_limit_dependency("does-not-exist")
 
+def test_rate_limited_marks_endpoint_with_cached_policy():
+    def endpoint():
+        return None
+
+    assert rate_limit.rate_limited("api_read")(endpoint) is endpoint
+    assert rate_limit._load_policies() is rate_limit._load_policies()
+    assert endpoint._rate_limit_policy is rate_limit._load_policies()["api_read"]
+
+
+def test_refresh_rate_limit_flag_snapshots_settings(monkeypatch):
+    monkeypatch.setattr(rate_limit.settings, "enable_optional_rate_limiting", True)
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_enabled", True)
+    rate_limit.refresh_rate_limit_flag()
+    assert rate_limit._should_rate_limit() is True
 
-def test_rate_limit_dependency_disabled_short_circuits(monkeypatch):
     monkeypatch.setattr(rate_limit.settings, "enable_optional_rate_limiting", False)
-    dependency = rate_limit.rate_limit_dependency("api_read").dependency
-    request = _request()
-    response = Response()
-    dependency(request, response)
+    assert rate_limit._should_rate_limit() is True
+    rate_limit.refresh_rate_limit_flag()
+    assert rate_limit._should_rate_limit() is False
 
 
-def test_rate_limit_dependency_handles_backend_errors(monkeypatch):
+def test_rate_limited_requires_known_policy():
+    with pytest.raises(ValueError):
+        rate_limit.rate_limited("does-not-exist")
+
+
+def test_enforce_rate_limit_handles_backend_errors(monkeypatch):
     class BrokenLimiter:
         def check(self, _policy, _principal):
             raise RedisError("down")
 
     rate_limit.set_rate_limiter(BrokenLimiter())  # type: ignore[arg-type]
-    dependency = rate_limit.rate_limit_dependency("api_read").dependency
+    policy = rate_limit._load_policies()["api_read"]
     request = _request()
-    response = Response()
 
-    monkeypatch.setattr(rate_limit.settings, "enable_optional_rate_limiting", True)
-    monkeypatch.setattr(rate_limit.settings, "rate_limit_enabled", True)
     monkeypatch.setattr(rate_limit.settings, "rate_limit_fail_open", True)
-    dependency(request, response)
+    assert rate_limit._enforce_rate_limit(request, policy) == []
 
     monkeypatch.setattr(rate_limit.settings, "rate_limit_fail_open", False)
     with pytest.raises(HTTPException) as exc:
-        dependency(request, response)
+        rate_limit._enforce_rate_limit(request, policy)
     assert exc.value.status_code == 503
 
 
-def test_rate_limit_dependency_sets_headers_and_raises_429(monkeypatch):
+def test_enforce_rate_limit_returns_headers_and_raises_429():
     class FakeLimiter:
         def __init__(self, allowed):
             self.allowed = allowed
@@ -113,18 +189,136 @@ def test_rate_limit_dependency_sets_headers_and_raises_429(monkeypatch):
                 return True, 9, 10
             return False, 0, 5
 
-    monkeypatch.setattr(rate_limit.settings, "enable_optional_rate_limiting", True)
-    monkeypatch.setattr(rate_limit.settings, "rate_limit_enabled", True)
-    monkeypatch.setattr(rate_limit.settings, "rate_limit_fail_open", True)
-    dependency = rate_limit.rate_limit_dependency("api_read").dependency
+    policy = rate_limit._load_policies()["api_read"]
     request = _request()
 
     rate_limit.set_rate_limiter(FakeLimiter(True))  # type: ignore[arg-type]
-    success_response = Response()
-    dependency(request, success_response)
-    assert success_response.headers["X-RateLimit-Remaining"] == "9"
+    assert rate_limit._enforce_rate_limit(request, policy) == [
+        policy.limit_header,
+        (b"x-ratelimit-remaining", b"9"),
+        (b"x-ratelimit-reset", b"10"),
+    ]
 
     rate_limit.set_rate_limiter(FakeLimiter(False))  # type: ignore[arg-type]
     with pytest.raises(HTTPException) as exc:
-        dependency(request, Response())
+        rate_limit._enforce_rate_limit(request, policy)
     assert exc.value.status_code == 429
+    assert exc.value.headers == {"Retry-After": "5"}
+
+
+def test_redis_rate_limiter_check_many_uses_one_script_call(monkeypatch):
+    monkeypatch.setattr(rate_limit.time, "time", lambda: 158.0)
+
+    class MultiRedis(DummyRedis):
+        def evalsha(self, sha, numkeys, *args):
+            super().evalsha(sha, numkeys, *args)
+            return [2, 7]
+
+    redis_client = MultiRedis()
+    limiter = rate_limit.RedisRateLimiter(redis_factory=lambda: redis_client)
+    policies = [
+        rate_limit.RateLimitPolicy(name="api_read", limit=5, window_seconds=60),
+        rate_limit.RateLimitPolicy(name="auth_login", limit=5, window_seconds=10),
+    ]
+
+    results = limiter.check_many(policies, "user:1")
+
+    # Both windows reset at their next bucket boundary: 180s and 160s.
+    assert results == [(True, 3, 22), (False, 0, 2)]
+    assert len(redis_client.calls) == 1
+    numkeys, *args = redis_client.calls[0]
+    assert numkeys == 2
+    assert args[0].startswith(b"rl:api_read:2:")
+    assert args[1].startswith(b"rl:auth_login:15:")
+    assert args[2:] == [b"60", b"10"]
+
+
+def _enable_rate_limiting(monkeypatch, *, fail_open=True):
+    rate_limit.set_rate_limit_enabled(True)
+    monkeypatch.setattr(rate_limit.settings, "rate_limit_fail_open", fail_open)
+
+
+class RecordingLimiter:
+    def __init__(self, result):
+        self.result = result
+        self.calls = []
+
+    def check(self, policy, principal):
+        self.calls.append((policy.name, principal))
+        return self.result
+
+
+def _rate_limited_client():
+    router = APIRouter(route_class=rate_limit.RateLimitedRoute)
+    calls = []
+
+    @router.get("/limited")
+    @rate_limit.rate_limited("api_read")
+    def limited():
+        calls.append("limited")
+        return {"ok": True}
+
+    @router.get("/open")
+    def unlimited():
+        return {"ok": True}
+
+    app = FastAPI()
+    app.include_router(router)
+    return TestClient(app), calls
+
+
+def test_rate_limited_route_adds_headers_before_dispatch(monkeypatch):
+    _enable_rate_limiting(monkeypatch)
+    limiter = RecordingLimiter((True, 4, 30))
+    rate_limit.set_rate_limiter(limiter)  # type: ignore[arg-type]
+    client, calls = _rate_limited_client()
+
+    response = client.get("/limited")
+    assert response.status_code == 200
+    assert response.headers["X-RateLimit-Remaining"] == "4"
+    assert response.headers["X-RateLimit-Reset"] == "30"
+    assert response.headers.get_list("X-RateLimit-Limit") == [
+        str(rate_limit._load_policies()["api_read"].limit)
+    ]
+    assert calls == ["limited"]
+
+    unmarked = client.get("/open")
+    assert "X-RateLimit-Remaining" not in unmarked.headers
+    assert [name for name, _ in limiter.calls] == ["api_read"]
+
+
+def test_rate_limited_route_rejects_without_running_endpoint(monkeypatch):
+    _enable_rate_limiting(monkeypatch)
+    rate_limit.set_rate_limiter(RecordingLimiter((False, 0, 12)))  # type: ignore[arg-type]
+    client, calls = _rate_limited_client()
+
+    response = client.get("/limited")
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "12"
+    assert calls == []
+
+
+def test_rate_limited_route_skips_limiter_when_disabled():
+    rate_limit.set_rate_limit_enabled(False)
+    limiter = RecordingLimiter((False, 0, 12))
+    rate_limit.set_rate_limiter(limiter)  # type: ignore[arg-type]
+    client, calls = _rate_limited_client()
+
+    assert client.get("/limited").status_code == 200
+    assert limiter.calls == []
+    assert calls == ["limited"]
+
+
+def test_app_routes_carry_their_rate_limit_policy():
+    policies = rate_limit._load_policies()
+    routes = {
+        (route.path, method): route
+        for route in main.app.routes
+        if isinstance(route, APIRoute)
+        for method in route.methods
+    }
+    login = routes[("/api/v1/login", "POST")]
+    assert isinstance(login, rate_limit.RateLimitedRoute)
+    assert login.endpoint._rate_limit_policy is policies["auth_login"]
+    read_posts = routes[("/api/v1/posts/", "GET")]
+    assert read_posts.endpoint._rate_limit_policy is policies["api_read"]
@@ -1,28 +1,47 @@
 import pytest
 from app import redis_client
+from redis._parsers import _HiredisParser
 from redis.exceptions import RedisError
 
 pytestmark = pytest.mark.unit
 
 
-def test_get_redis_client_uses_configured_url(monkeypatch):
+def test_get_redis_client_uses_configured_pool(monkeypatch):
+    monkeypatch.setattr(
+        redis_client.settings, "redis_url", "redis://cache.internal:6380/2"
+    )
+    monkeypatch.setattr(redis_client.settings, "redis_max_connections", 12)
+    monkeypatch.setattr(
+        redis_client.settings, "redis_health_check_interval_seconds", 15
+    )
     redis_client.reset_redis_client()
-    captured = {}
-
-    class DummyRedis:
-        pass
-
-    def _from_url(url, decode_responses):
-        captured["url"] = url
-        captured["decode"] = decode_responses
-        return DummyRedis()
-
-    monkeypatch.setattr(redis_client.Redis, "from_url", _from_url)
-    client = redis_client.get_redis_client()
-
-    assert isinstance(client, DummyRedis)
-    assert captured["url"] == redis_client.settings.redis_url
-    assert captured["decode"] is True
+    try:
+        client = redis_client.get_redis_client()
+        pool = client.connection_pool
+        kwargs = pool.connection_kwargs
+
+        assert client is redis_client.get_redis_client()
+        assert (kwargs["host"], kwargs["port"], kwargs["db"]) == (
+            "cache.internal",
+            6380,
+            2,
+        )
+        assert pool.max_connections == 12
+        assert kwargs["health_check_interval"] == 15
+        assert kwargs["socket_keepalive"] is True
+        assert kwargs.get("decode_responses", False) is False
+    finally:
+        redis_client.reset_redis_client()
+
+
+def test_get_redis_client_parses_replies_with_hiredis():
+    pytest.importorskip("hiredis")
+    redis_client.reset_redis_client()
+    try:
+        connection = redis_client.get_redis_client().connection_pool.make_connection()
+        assert isinstance(connection._parser, _HiredisParser)
+    finally:
+        redis_client.reset_redis_client()
 
 
 def test_ping_redis_handles_success_and_failure(monkeypatch):
@@ -0,0 +1,28 @@
+from datetime import datetime, timezone
+
+import pytest
+from app import schemas
+from pydantic import ValidationError
+
+pytestmark = pytest.mark.unit
+
+
+def test_user_out_accepts_stored_email_and_keeps_email_format():
+    user = schemas.UserOut(
+        id=1, email="stored@example.com", created_at=datetime.now(timezone.utc)
+    )
+
+    assert user.email == "stored@example.com"
+    email_schema = schemas.UserOut.model_json_schema()["properties"]["email"]
+    assert email_schema["format"] == "email"
+
+
+@pytest.mark.parametrize(
+    "email",
+    ["not-an-email", "stored.example.com", "stored@localhost", "sto red@example.com"],
+)
+def test_user_out_rejects_malformed_stored_email(email):
+    with pytest.raises(ValidationError) as exc_info:
+        schemas.UserOut(id=1, email=email, created_at=datetime.now(timezone.utc))
+
+    assert exc_info.value.errors()[0]["loc"] == ("email",)
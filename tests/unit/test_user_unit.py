@@ -1,5 +1,6 @@
 import pytest
-from app import schemas
+from app import models, schemas
+from sqlalchemy import event, select
 
 pytestmark = pytest.mark.integration
 
@@ -38,3 +39,32 @@ def test_create_user_duplicate_email_returns_conflict(client, test_user):
 
     assert duplicate_response.status_code == 409
     assert duplicate_response.json()["detail"] == "Email is already registered"
+
+
+def test_create_user_writes_user_and_outbox_event_in_one_statement(client, session):
+    statements: list[str] = []
+
+    def record(_conn, _cursor, statement, *_args):
+        statements.append(statement)
+
+    engine = session.get_bind()
+    event.listen(engine, "before_cursor_execute", record)
+    try:
+        response = client.post(
+            "/api/v1/users/",
+            json={"email": "outbox-user@example.com", "password": "password123"},
+        )
+    finally:
+        event.remove(engine, "before_cursor_execute", record)
+
+    assert response.status_code == 201
+    created = response.json()
+    inserts = [statement for statement in statements if "INSERT" in statement]
+    assert len(inserts) == 1
+    assert "outbox_events" in inserts[0]
+
+    queued = session.scalars(select(models.OutboxEvent)).one()
+    assert queued.topic == "user.created"
+    assert queued.payload == {"user_id": created["id"], "email": created["email"]}
+    assert queued.status == "pending"
+    assert queued.event_key